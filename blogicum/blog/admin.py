@@ -1,31 +1,288 @@
 from django.contrib import admin
+from django.contrib.admin.utils import quote, unquote
+from django.contrib.admin.widgets import (
+    AdminTextareaWidget, AutocompleteSelect,
+)
+from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.forms import modelform_factory
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
 
-from .models import Category, Comment, Location, Post
+from .bulk import bulk_delete, bulk_update
+from .constants import ADMIN_PREVIEW_LEN
+from .models import Category, Comment, Location, Post, User
+
+
+def estimate_row_count(model, using):
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}'
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that estimates the size of large unfiltered tables.
+
+    On SQLite the estimate is `MAX(rowid)`, which never undercounts; the
+    last pages may come out empty after deletions. Filtered querysets and
+    tables under `exact_count_limit` rows are counted exactly.
+    """
+
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate and estimate > self.exact_count_limit:
+                return estimate
+        return super().count
+
+
+class TextPreviewMixin:
+    """Changelist column with the start of `text` cut in SQL; the full
+    `text` column is not loaded on the changelist.
+
+    The preview links to a page that edits only `text`: it loads one row
+    and renders one textarea instead of the whole change form, and saves
+    with `update_fields=['text']`.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    changelist_deferred = ('text',)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name.endswith('_changelist'):
+            queryset = queryset.defer(*self.changelist_deferred).annotate(
+                text_preview=Substr('text', 1, ADMIN_PREVIEW_LEN)
+            )
+        return queryset
+
+    @admin.display(description='Текст', ordering='text_preview')
+    def text_preview(self, obj):
+        preview = obj.text_preview
+        if len(preview) >= ADMIN_PREVIEW_LEN:
+            preview = f'{preview}…'
+        return format_html('<a href="{}">{}</a>', self.text_url(obj), preview)
+
+    def text_url(self, obj):
+        opts = self.model._meta
+        return reverse(
+            f'admin:{opts.app_label}_{opts.model_name}_text',
+            args=(quote(obj.pk),),
+            current_app=self.admin_site.name,
+        )
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                '<path:object_id>/text/',
+                self.admin_site.admin_view(self.text_view),
+                name=f'{opts.app_label}_{opts.model_name}_text',
+            ),
+        ] + super().get_urls()
+
+    def text_view(self, request, object_id):
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            return self._get_obj_does_not_exist_redirect(
+                request, self.model._meta, object_id
+            )
+        if not self.has_change_permission(request, obj):
+            raise PermissionDenied
+        form_class = modelform_factory(
+            self.model, fields=('text',),
+            widgets={'text': AdminTextareaWidget},
+        )
+        form = form_class(request.POST or None, instance=obj)
+        if form.is_valid():
+            obj = form.save(commit=False)
+            obj.save(update_fields=['text'])
+            self.log_change(
+                request, obj,
+                self.construct_change_message(request, form, None),
+            )
+            self.message_user(request, f'Текст «{obj}» сохранён.')
+            opts = self.model._meta
+            return redirect(
+                f'admin:{opts.app_label}_{opts.model_name}_changelist'
+            )
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'Изменить текст: {obj}',
+            'opts': self.model._meta,
+            'original': obj,
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/text_form.html', context)
+
+
+class AutocompleteSearchMixin:
+    """Prefix search on `autocomplete_search_fields` for autocomplete widgets.
+
+    `istartswith` lookups keep the autocomplete endpoint cheap on large
+    tables; the changelist search keeps using `search_fields`.
+    """
+
+    autocomplete_search_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        match = request.resolver_match
+        if match and match.url_name == 'autocomplete' and search_term:
+            query = Q()
+            for field in self.autocomplete_search_fields:
+                query |= Q(**{f'{field}__istartswith': search_term})
+            return queryset.filter(query), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+class RowAutocompleteSelect(AutocompleteSelect):
+    """Autocomplete select that labels the chosen option from the row's
+    already loaded related object instead of querying for it."""
+
+    selected_object = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = self.selected_object
+        if selected is None or [str(selected.pk)] != [str(v) for v in value]:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name,
+            selected.pk,
+            self.choices.field.label_from_instance(selected),
+            True,
+            len(options),
+        ))
+        return [(None, options, 0)]
+
+
+class RowAutocompleteMixin:
+    """Use `RowAutocompleteSelect` for `autocomplete_fields` so that
+    `list_editable` foreign keys cost no query per changelist row."""
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs['widget'] = RowAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get('using')
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_form(self, request, **kwargs):
+        base_form = super().get_changelist_form(request, **kwargs)
+
+        class ChangelistForm(base_form):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                for name, field in self.fields.items():
+                    widget = getattr(field.widget, 'widget', field.widget)
+                    if isinstance(widget, RowAutocompleteSelect):
+                        widget.selected_object = getattr(
+                            self.instance, name, None
+                        )
+
+        return ChangelistForm
+
+
+class BulkDeleteMixin:
+    """Delete the selection batch by batch without loading it."""
+
+    actions = ('bulk_delete_selected',)
+
+    @admin.action(
+        description='Удалить выбранные (пакетно)', permissions=('delete',)
+    )
+    def bulk_delete_selected(self, request, queryset):
+        deleted = bulk_delete(queryset)
+        self.message_user(request, f'Удалено записей: {deleted}.')
+
+
+class BulkPublishMixin(BulkDeleteMixin):
+    """Publish or unpublish the selection with set-based updates."""
+
+    actions = (
+        'publish_selected', 'unpublish_selected', 'bulk_delete_selected'
+    )
+
+    @admin.action(description='Опубликовать выбранные',
+                  permissions=('change',))
+    def publish_selected(self, request, queryset):
+        updated = bulk_update(queryset.filter(is_published=False),
+                              is_published=True)
+        self.message_user(request, f'Опубликовано записей: {updated}.')
+
+    @admin.action(description='Снять с публикации выбранные',
+                  permissions=('change',))
+    def unpublish_selected(self, request, queryset):
+        updated = bulk_update(queryset.filter(is_published=True),
+                              is_published=False)
+        self.message_user(
+            request, f'Снято с публикации записей: {updated}.'
+        )
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(AutocompleteSearchMixin, UserAdmin):
+    autocomplete_search_fields = ('username',)
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BulkPublishMixin, TextPreviewMixin, RowAutocompleteMixin,
+                AutocompleteSearchMixin, admin.ModelAdmin):
     search_fields = ('text',)
+    autocomplete_search_fields = ('title',)
+    autocomplete_fields = ('author', 'category', 'location')
+    list_select_related = ('author',)
     list_display = (
         'id',
         'title',
         'is_published',
-        'text',
+        'text_preview',
         'author',
         'created_at',
         'pub_date',
+        'view_count',
     )
     list_display_links = ('id',)
-    list_editable = (
-        'text',
-        'author',
-    )
+    list_editable = ('author',)
     empty_value_display = 'Не задано'
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BulkPublishMixin, AutocompleteSearchMixin,
+                    admin.ModelAdmin):
     search_fields = ('title',)
+    autocomplete_search_fields = ('title', 'slug')
     list_display = (
         'id',
         'title',
@@ -41,8 +298,10 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(BulkPublishMixin, AutocompleteSearchMixin,
+                    admin.ModelAdmin):
     search_fields = ('name',)
+    autocomplete_search_fields = ('name',)
     list_display = (
         'id',
         'name',
@@ -53,18 +312,19 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(BulkDeleteMixin, TextPreviewMixin, RowAutocompleteMixin,
+                   admin.ModelAdmin):
     search_fields = ('text',)
+    autocomplete_fields = ('author', 'post')
+    list_select_related = ('author', 'post')
+    changelist_deferred = ('text', 'post__text')
     list_display = (
         'id',
-        'text',
+        'text_preview',
         'post',
         'created_at',
         'author',
     )
     list_display_links = ('id',)
-    list_editable = (
-        'text',
-        'author',
-    )
+    list_editable = ('author',)
     empty_value_display = 'Не задано'
@@ -0,0 +1,174 @@
+"""Async versions of the public read views, used when `ASYNC_VIEWS` is on.
+
+Django 3.2 has no async ORM, so each query runs in a worker thread via
+`db()`; queries that do not depend on each other are awaited together.
+Templates are rendered in the sync thread, as lazy `request.user` and
+friends may still query the database.
+"""
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import Page, Paginator
+from django.db import close_old_connections
+from django.http import Http404
+from django.shortcuts import render
+
+from blogicum.settings import PAGINATOR
+from perf.replicas import read_from_replica
+from . import feed, stats
+from .forms import CommentForm
+from .lookups import profiles, published_categories
+from .models import Post
+from .view_counts import view_counter
+
+render_async = sync_to_async(render)
+
+
+def _closing(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+def db(func, *args, **kwargs):
+    """Run ORM code `func` in a worker thread of its own."""
+    return sync_to_async(_closing(func), thread_sensitive=False)(
+        *args, **kwargs
+    )
+
+
+def _rows(queryset, bottom, top):
+    return list(queryset[bottom:top])
+
+
+async def _count(queryset, count):
+    return count if count is not None else await db(queryset.count)
+
+
+async def get_page(queryset, page, strict, count=None):
+    """Count and fetch page `page` of `queryset` concurrently.
+
+    `strict` follows `ListView` (404 on a bad page, `'last'` allowed),
+    otherwise `Paginator.get_page` (fall back to the first or last page).
+    A known `count` saves the `COUNT` query.
+    """
+    paginator = Paginator(queryset, PAGINATOR)
+    try:
+        number = int(page or 1)
+    except (TypeError, ValueError):
+        if strict and page != 'last':
+            raise Http404('Invalid page.')
+        number = None if strict else 1
+    if number is not None and number >= 1:
+        bottom = (number - 1) * PAGINATOR
+        paginator.count, rows = await asyncio.gather(
+            _count(queryset, count),
+            db(_rows, queryset, bottom, bottom + PAGINATOR),
+        )
+        if rows or number == 1:
+            return Page(rows, number, paginator)
+        if strict:
+            raise Http404('Invalid page.')
+    elif strict and number is not None:
+        raise Http404('Invalid page.')
+    else:
+        paginator.count = await _count(queryset, count)
+    number = paginator.num_pages
+    rows = await db(
+        _rows, queryset, (number - 1) * PAGINATOR, number * PAGINATOR
+    )
+    return Page(rows, number, paginator)
+
+
+def _list_context(page_obj):
+    return {
+        'paginator': page_obj.paginator,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+        'object_list': page_obj.object_list,
+        'post_list': page_obj.object_list,
+    }
+
+
+@read_from_replica
+async def index(request):
+    page_obj = await get_page(
+        feed.visible_entries(), request.GET.get('page'), strict=True
+    )
+    page_obj.object_list = [entry.as_post() for entry in page_obj]
+    return await render_async(
+        request, 'blog/index.html', _list_context(page_obj)
+    )
+
+
+@read_from_replica
+async def category_posts(request, category_slug):
+    queryset = Post.objects.published().filter(
+        category__slug=category_slug,
+    ).for_feed().with_comment_counts()
+    category, page_obj = await asyncio.gather(
+        db(published_categories.get, category_slug),
+        get_page(queryset, request.GET.get('page'), strict=True),
+    )
+    if category is None:
+        raise Http404('No Category matches the given query.')
+    return await render_async(request, 'blog/category.html', {
+        **_list_context(page_obj),
+        'category': category,
+    })
+
+
+def _viewer(request):
+    # Evaluates the lazy `request.user`, which may query the database.
+    return request.user if request.user.is_authenticated else None
+
+
+@read_from_replica
+async def profile(request, username):
+    viewer, user = await asyncio.gather(
+        sync_to_async(_viewer)(request),
+        db(profiles.get, username),
+    )
+    if user is None:
+        raise Http404('No User matches the given query.')
+    queryset = Post.objects.visible_to(viewer).filter(
+        author_id=user.pk,
+    ).for_feed().with_comment_counts()
+    user_stats = await db(stats.get, user)
+    page_obj = await get_page(
+        queryset, request.GET.get('page'), strict=False,
+        count=stats.visible_posts(user_stats, viewer),
+    )
+    return await render_async(request, 'blog/profile.html', {
+        'profile': user,
+        'stats': user_stats,
+        'page_obj': page_obj,
+    })
+
+
+def _get_post(post_id, viewer):
+    try:
+        return Post.objects.visible_to(viewer).for_feed().get(pk=post_id)
+    except Post.DoesNotExist:
+        raise Http404('No Post matches the given query.')
+
+
+@read_from_replica
+async def post_detail(request, post_id):
+    viewer = await sync_to_async(_viewer)(request)
+    # Comments only once the post is known to be visible: a 404 costs
+    # one query.
+    post = await db(_get_post, post_id, viewer)
+    comments = await db(list, post.comments.select_related('author'))
+    post.view_count += view_counter.hit(post.pk)
+    return await render_async(request, 'blog/detail.html', {
+        'object': post,
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments,
+    })
@@ -0,0 +1,114 @@
+from django.db import models, transaction
+from django.db.models.deletion import (
+    ProtectedError, get_candidate_relations_to_delete
+)
+
+from .constants import BULK_BATCH_SIZE
+from .signals import bulk_changed, bulk_deleting
+
+
+def iter_pk_batches(queryset, batch_size=BULK_BATCH_SIZE):
+    """Primary keys of `queryset` in ascending batches, paged by key so
+    that rows changed or deleted by earlier batches do not shift later
+    ones."""
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        page = pks if last is None else pks.filter(pk__gt=last)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+
+
+def bulk_update(queryset, batch_size=BULK_BATCH_SIZE, **values):
+    """Set `values` on every row of `queryset` with one `UPDATE` per batch.
+
+    Skips `save()` and its signals; `bulk_changed` is sent once at the end.
+    """
+    model = queryset.model
+    rows = model._base_manager.using(queryset.db)
+    updated = 0
+    pks = []
+    for batch in iter_pk_batches(queryset, batch_size):
+        with transaction.atomic(using=queryset.db):
+            updated += rows.filter(pk__in=batch).update(**values)
+        pks += batch
+    if updated:
+        bulk_changed.send(sender=model, using=queryset.db, pks=pks)
+    return updated
+
+
+def _plan_delete(rows, plan):
+    """Append `rows` and, recursively, what their deletion cascades to.
+
+    `plan` gets `('delete', rows)` and `('set_null', rows, field)` steps;
+    rows are querysets filtered by subqueries on their parents, so no
+    primary key list is loaded.
+    """
+    plan.append(('delete', rows))
+    for relation in get_candidate_relations_to_delete(rows.model._meta):
+        field = relation.field
+        on_delete = field.remote_field.on_delete
+        if on_delete is models.DO_NOTHING:
+            continue
+        children = relation.related_model._base_manager.using(
+            rows.db
+        ).filter(**{
+            f'{field.name}__in': rows.values(field.target_field.attname),
+        })
+        if on_delete is models.CASCADE:
+            _plan_delete(children, plan)
+        elif on_delete is models.SET_NULL:
+            plan.append(('set_null', children, field.name))
+        elif on_delete is models.PROTECT:
+            if children.exists():
+                raise ProtectedError(
+                    f'Cannot delete rows referenced through {field}.',
+                    set(children[:10]),
+                )
+        else:
+            raise ValueError(f'bulk_delete does not support {field}.')
+
+
+def bulk_delete(queryset, batch_size=BULK_BATCH_SIZE):
+    """Delete every row of `queryset` with set-based DELETEs per batch.
+
+    Cascades and SET_NULL are applied by this function, one statement per
+    related model, without loading rows or sending `pre_delete` and
+    `post_delete`. Instead `bulk_deleting` is sent for each model of a
+    batch before anything is deleted, and `bulk_changed` once at the end.
+    """
+    model = queryset.model
+    using = queryset.db
+    rows = model._base_manager.using(using)
+    deleted = 0
+    pks = []
+    for batch in iter_pk_batches(queryset, batch_size):
+        plan = []
+        _plan_delete(rows.filter(pk__in=batch), plan)
+        with transaction.atomic(using=using):
+            followups = [
+                response
+                for step in plan if step[0] == 'delete'
+                for _, response in bulk_deleting.send(
+                    sender=step[1].model, using=using, rows=step[1],
+                )
+                if callable(response)
+            ]
+            for step in plan:
+                if step[0] == 'set_null':
+                    step[1].update(**{step[2]: None})
+            # Deepest relations first: their querysets select through
+            # the rows of their parents, which go last.
+            for step in reversed(plan[1:]):
+                if step[0] == 'delete':
+                    step[1]._raw_delete(using)
+            deleted += plan[0][1]._raw_delete(using)
+            for followup in followups:
+                followup()
+        pks += batch
+    if deleted:
+        bulk_changed.send(sender=model, using=using, pks=pks)
+    return deleted
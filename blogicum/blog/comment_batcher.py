@@ -0,0 +1,189 @@
+"""Group commit for new comments (`settings.COMMENT_GROUP_COMMIT`).
+
+Under a comment flood each `save()` is its own transaction, and on
+SQLite every commit waits for the single writer lock and a sync to
+disk. `CommentBatcher.submit()` instead hands the comment to a writer
+thread, which collects comments for up to `COMMENT_BATCH_WINDOW_MS`
+milliseconds (or `COMMENT_BATCH_MAX` comments), checks all their posts
+with one query and inserts them with one `bulk_create` in one
+transaction. `submit()` returns once that transaction has committed.
+A comment the writer has not taken within `timeout` seconds is withdrawn
+and never written, so the client may safely send it again.
+"""
+import atexit
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import BooleanField, ExpressionWrapper
+
+from .managers import published_q
+from .models import Comment, Post
+from .signals import comments_created
+
+
+class _Pending:
+
+    def __init__(self, comment):
+        self.comment = comment
+        self.error = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _settle(self, state):
+        with self._lock:
+            if self._state is None:
+                self._state = state
+            return self._state == state
+
+    def take(self):
+        """Claim the comment for writing, unless it was withdrawn."""
+        return self._settle('taken')
+
+    def withdraw(self):
+        """Withdraw the comment, unless the writer has taken it."""
+        return self._settle('withdrawn')
+
+
+class CommentBatcher:
+
+    def __init__(self, window_ms=5, max_batch=500, timeout=10):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.comments = 0
+
+    def submit(self, comment):
+        """Save unsaved `comment` with the next batch.
+
+        Raises `Post.DoesNotExist` if its author may not see its post,
+        and `TimeoutError` if the writer did not take it in time; then it
+        is not saved. The comment is saved with `bulk_create`: on SQLite
+        its `pk` stays unset.
+        """
+        self._start()
+        pending = _Pending(comment)
+        self._queue.put(pending)
+        if not pending.done.wait(self.timeout):
+            if pending.withdraw():
+                raise TimeoutError('Comment batch was not committed in time.')
+            # Already being written: its transaction decides.
+            pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return comment
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='comment-batcher', daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        """Write what is queued and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = self._collect(item)
+            # Replace a broken or expired connection before each batch.
+            close_old_connections()
+            try:
+                self.flush(batch)
+            finally:
+                close_old_connections()
+
+    def flush(self, batch):
+        """Write the comments of `batch`, a list of `_Pending`."""
+        batch = [pending for pending in batch if pending.take()]
+        try:
+            accepted = self._check_posts(batch)
+            try:
+                self._write([pending.comment for pending in accepted])
+            except DatabaseError:
+                # Find the offending comment: write the others one by one.
+                for pending in accepted:
+                    try:
+                        self._write([pending.comment])
+                    except DatabaseError as error:
+                        pending.error = error
+            self.batches += 1
+            self.comments += len(accepted)
+        except Exception as error:
+            for pending in batch:
+                pending.error = pending.error or error
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+    def _check_posts(self, batch):
+        """Pendings whose authors may see their posts; fails the others."""
+        posts = {
+            pk: (author_id, public)
+            for pk, author_id, public in Post.objects.filter(
+                pk__in={pending.comment.post_id for pending in batch},
+            ).annotate(
+                public=ExpressionWrapper(
+                    published_q(), output_field=BooleanField()
+                ),
+            ).values_list('pk', 'author_id', 'public')
+        }
+        accepted = []
+        for pending in batch:
+            comment = pending.comment
+            author_id, public = posts.get(comment.post_id, (None, False))
+            if public or (author_id is not None
+                          and author_id == comment.author_id):
+                accepted.append(pending)
+            else:
+                pending.error = Post.DoesNotExist(
+                    'No Post matches the given query.'
+                )
+        return accepted
+
+    def _write(self, comments):
+        if not comments:
+            return
+        with transaction.atomic():
+            Comment.objects.bulk_create(comments)
+            comments_created.send(sender=Comment, comments=comments)
+
+
+comment_batcher = CommentBatcher(
+    window_ms=getattr(settings, 'COMMENT_BATCH_WINDOW_MS', 5),
+    max_batch=getattr(settings, 'COMMENT_BATCH_MAX', 500),
+)
+atexit.register(comment_batcher.stop)
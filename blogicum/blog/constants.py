@@ -1 +1,11 @@
 PRE_TEXT_LEN: int = 25
+
+ADMIN_PREVIEW_LEN: int = 50
+
+BULK_BATCH_SIZE: int = 1000
+
+EXPORT_CHUNK_SIZE: int = 2000
+
+IMPORT_BATCH_SIZE: int = 2000
+
+FEED_EXCERPT_WORDS: int = 10
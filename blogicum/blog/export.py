@@ -0,0 +1,81 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .constants import EXPORT_CHUNK_SIZE
+from .models import Comment, Post
+
+# Output column -> lookup; related names come from joins in the same query.
+EXPORTS = {
+    'posts': (Post, {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'created_at': 'created_at',
+        'is_published': 'is_published',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location__name',
+        'image': 'image',
+    }),
+    'comments': (Comment, {
+        'id': 'id',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created_at': 'created_at',
+    }),
+}
+
+
+def iter_chunks(name, after=0, chunk_size=EXPORT_CHUNK_SIZE):
+    """Rows of export `name` with `id > after` as lists of dicts.
+
+    Pages by primary key, so memory use is bounded by `chunk_size` and an
+    interrupted export can resume from the last `id` written.
+    """
+    model, columns = EXPORTS[name]
+    queryset = model.objects.order_by('pk').values_list(*columns.values())
+    while True:
+        chunk = list(queryset.filter(pk__gt=after)[:chunk_size])
+        if not chunk:
+            return
+        yield [dict(zip(columns, row)) for row in chunk]
+        after = chunk[-1][0]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(chunk):
+    for row in chunk:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def csv_lines(chunk):
+    writer = csv.writer(_Echo())
+    for row in chunk:
+        yield writer.writerow(row.values())
+
+
+def csv_header(name):
+    return csv.writer(_Echo()).writerow(EXPORTS[name][1])
+
+
+FORMATS = {
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+    'csv': (csv_lines, 'text/csv'),
+}
+
+
+def stream(name, export_format, after=0, chunk_size=EXPORT_CHUNK_SIZE):
+    """Text lines of the export; CSV starts with a header unless resumed."""
+    lines, _ = FORMATS[export_format]
+    if export_format == 'csv' and not after:
+        yield csv_header(name)
+    for chunk in iter_chunks(name, after, chunk_size):
+        yield from lines(chunk)
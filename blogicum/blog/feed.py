@@ -0,0 +1,74 @@
+"""Materialized index feed: one `FeedEntry` per post the index may show.
+
+Entries are written for published posts in published categories, future
+`pub_date`s included, so reading the feed is a range scan of the
+`(pub_date, post)` index up to now. The receivers in `blog.signals`
+keep entries in step with posts, comments, categories, locations and
+authors; `rebuild()` (`manage.py rebuild_feed`) recomputes everything.
+"""
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .constants import BULK_BATCH_SIZE, FEED_EXCERPT_WORDS
+from .models import FeedEntry, Post
+
+
+def visible_entries():
+    return FeedEntry.objects.filter(pub_date__lte=timezone.now())
+
+
+def excerpt(text):
+    # What `truncatewords` in the post card shows; truncating it again
+    # gives the same string.
+    return Truncator(text).words(FEED_EXCERPT_WORDS, truncate=' …')
+
+
+def make_entry(post):
+    location = post.location
+    return FeedEntry(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt=excerpt(post.text),
+        image=post.image.name or '',
+        author_username=post.author.username,
+        category_id=post.category_id,
+        category_slug=post.category.slug,
+        category_title=post.category.title,
+        location_name=(
+            location.name if location and location.is_published else None
+        ),
+        comment_count=post.comment_count,
+        view_count=post.view_count,
+    )
+
+
+def eligible_posts():
+    return Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+    ).for_feed().with_comment_counts()
+
+
+def refresh_posts(pks):
+    """Recompute the entries of posts `pks`, dropping ineligible ones."""
+    pks = list(pks)
+    for start in range(0, len(pks), BULK_BATCH_SIZE):
+        batch = pks[start:start + BULK_BATCH_SIZE]
+        with transaction.atomic():
+            # Read in the same transaction, or a view count flush made
+            # in between would be overwritten.
+            entries = [
+                make_entry(post)
+                for post in eligible_posts().filter(pk__in=batch)
+            ]
+            FeedEntry.objects.filter(post_id__in=batch).delete()
+            FeedEntry.objects.bulk_create(entries)
+
+
+def rebuild():
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        refresh_posts(Post.objects.values_list('pk', flat=True))
+    return FeedEntry.objects.count()
@@ -0,0 +1,175 @@
+import json
+from collections import Counter
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import connections, transaction
+
+from .constants import IMPORT_BATCH_SIZE
+from .signals import bulk_changed
+
+# Parents before children: rows are flushed in this order.
+IMPORT_MODELS = (
+    'auth.user', 'blog.category', 'blog.location', 'blog.post',
+    'blog.comment',
+)
+READ_SIZE = 1 << 16
+
+
+class _ArrayReader:
+    def __init__(self, stream, read_size):
+        self.stream = stream
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer, self.pos, self.eof = '', 0, False
+
+    def read_more(self):
+        if self.eof:
+            raise ValueError('Unexpected end of fixture.')
+        chunk = self.stream.read(self.read_size)
+        self.eof = not chunk
+        self.buffer, self.pos = self.buffer[self.pos:] + chunk, 0
+
+    def peek(self):
+        """Next non-whitespace character, reading on as needed."""
+        while True:
+            while (self.pos < len(self.buffer)
+                   and self.buffer[self.pos] in ' \t\r\n'):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self.read_more()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f'Expected {char!r} in fixture, got {found!r}.')
+        self.pos += 1
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                if self.complete(item, end):
+                    self.pos = end
+                    return item
+            self.read_more()
+
+    def complete(self, item, end):
+        """Whether the decoded `item` can not go on past `end`.
+
+        Objects, arrays and strings end with their closing character. A
+        number or literal cut by the end of the buffer decodes as a
+        shorter one (`12` of `1234`, `1` of `1.5`), so it only counts
+        once a delimiter, or the end of the stream, follows it.
+        """
+        if isinstance(item, (dict, list, str)) or self.eof:
+            return True
+        return end < len(self.buffer) and self.buffer[end] in ' \t\r\n,]'
+
+
+def iter_json_array(stream, read_size=READ_SIZE):
+    """Decode the items of the top-level JSON array in `stream` one by one.
+
+    Only the current item and one read of `read_size` characters are kept
+    in memory, whatever the size of the file.
+    """
+    reader = _ArrayReader(stream, read_size)
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield reader.decode()
+        if reader.peek() == ']':
+            return
+        reader.expect(',')
+
+
+class BulkLoader:
+    """Insert fixture objects of `IMPORT_MODELS` in batches.
+
+    Rows go through the raw insert `loaddata` uses (so `auto_now_add`
+    fields keep their fixture values), but many at a time and without
+    `save()` or model signals. Other models and many-to-many data are
+    skipped and counted in `skipped`.
+    """
+
+    def __init__(self, using='default', batch_size=IMPORT_BATCH_SIZE,
+                 ignore_conflicts=False):
+        self.using = using
+        self.batch_size = batch_size
+        self.ignore_conflicts = ignore_conflicts
+        self.models = [apps.get_model(label) for label in IMPORT_MODELS]
+        self.pending = {model: [] for model in self.models}
+        self.loaded = Counter()
+        self.loaded_pks = {model: [] for model in self.models}
+        self.skipped = Counter()
+
+    def _importable(self, objects):
+        for obj in objects:
+            if obj['model'].lower() in IMPORT_MODELS:
+                yield obj
+            else:
+                self.skipped[obj['model']] += 1
+
+    def _insert(self, model):
+        objs = self.pending[model]
+        if not objs:
+            return
+        fields = model._meta.local_concrete_fields
+        ops = connections[self.using].ops
+        step = max(ops.bulk_batch_size(fields, objs), 1)
+        for start in range(0, len(objs), step):
+            model._base_manager._insert(
+                objs[start:start + step], fields=fields, using=self.using,
+                raw=True, ignore_conflicts=self.ignore_conflicts,
+            )
+        self.loaded[model] += len(objs)
+        self.loaded_pks[model] += [obj.pk for obj in objs]
+        objs.clear()
+
+    def flush(self, model=None):
+        """Insert pending rows of `model` and of the models it follows."""
+        end = len(self.models) if model is None else (
+            self.models.index(model) + 1
+        )
+        for pending_model in self.models[:end]:
+            self._insert(pending_model)
+
+    def load(self, objects):
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled():
+                for deserialized in Deserializer(
+                    self._importable(objects), using=self.using,
+                    ignorenonexistent=True,
+                ):
+                    model = type(deserialized.object)
+                    batch = self.pending[model]
+                    batch.append(deserialized.object)
+                    if len(batch) >= self.batch_size:
+                        self.flush(model)
+                self.flush()
+            loaded_models = [model for model in self.models
+                             if self.loaded[model]]
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in loaded_models]
+            )
+            statements = connection.ops.sequence_reset_sql(
+                no_style(), loaded_models
+            )
+            if statements:
+                with connection.cursor() as cursor:
+                    for sql in statements:
+                        cursor.execute(sql)
+        for model in loaded_models:
+            bulk_changed.send(
+                sender=model, using=self.using, pks=self.loaded_pks[model]
+            )
+        return self.loaded
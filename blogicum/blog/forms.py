@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
+from django.db.models import Q
+from django.urls import reverse_lazy
 
-from .models import Comment, Post, User
+from .lookups import published_categories, published_locations
+from .models import Category, Comment, Location, Post, User
 
 
 class NewUserCreationForm(UserCreationForm):
@@ -16,6 +19,19 @@ class ProfileEditForm(forms.ModelForm):
         fields = ('first_name', 'last_name', 'email', 'username',)
 
 
+class LocationAutocompleteSelect(forms.Select):
+    """Select that renders only the chosen option; the rest are looked up
+    through the `blog:location_autocomplete` endpoint."""
+
+    def __init__(self, attrs=None):
+        super().__init__(attrs={
+            'data-autocomplete-url': reverse_lazy(
+                'blog:location_autocomplete'
+            ),
+            **(attrs or {}),
+        })
+
+
 class PostForm(forms.ModelForm):
 
     class Meta:
@@ -25,9 +41,52 @@ class PostForm(forms.ModelForm):
             'pub_date': forms.DateTimeInput(
                 format='%d/%m/%Y %H:%M',
                 attrs={'type': 'datetime-local'},
-            )
+            ),
+            'location': LocationAutocompleteSelect(),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Published rows, plus the post's own ones even if they were
+        # unpublished since, so that editing the post keeps them.
+        category = self.fields['category']
+        category.queryset = Category.objects.filter(
+            Q(is_published=True) | Q(pk=self.instance.category_id)
+        )
+        choices = published_categories.choices()
+        category_id = self.instance.category_id
+        if category_id is not None and category_id not in dict(choices):
+            choices = [self.current_choice('category'), *choices]
+        category.choices = [('', category.empty_label), *choices]
+        location = self.fields['location']
+        location.queryset = Location.objects.filter(
+            Q(is_published=True) | Q(pk=self.instance.location_id)
+        )
+        location.choices = [
+            ('', location.empty_label),
+            *self.selected_location_choice(),
+        ]
+
+    def current_choice(self, name):
+        """`(pk, label)` of the post's current `name`, or None."""
+        if getattr(self.instance, f'{name}_id') is None:
+            return None
+        related = getattr(self.instance, name)
+        return (related.pk, str(related))
+
+    def selected_location_choice(self):
+        value = self['location'].value()
+        value = getattr(value, 'pk', value)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return []
+        location = published_locations.get(value)
+        if location is not None:
+            return [(location.pk, str(location))]
+        current = self.current_choice('location')
+        return [current] if current and current[0] == value else []
+
 
 class CommentForm(forms.ModelForm):
 
@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import Category, Location, User
+
+_MISSING = object()
+
+
+class PrefixIndex:
+    """Case-insensitive word-prefix search over `(pk, name)` rows."""
+
+    def __init__(self, rows):
+        self.entries = sorted(
+            (word, pk, name)
+            for pk, name in rows
+            for word in set(name.casefold().split())
+        )
+        self.words = [word for word, _, _ in self.entries]
+
+    def search(self, query, limit=20):
+        terms = query.casefold().split()
+        if not terms:
+            return []
+        first = terms[0]
+        found = {}
+        start = bisect_left(self.words, first)
+        for word, pk, name in self.entries[start:]:
+            if not word.startswith(first):
+                break
+            if pk in found:
+                continue
+            words = name.casefold().split()
+            if all(any(w.startswith(term) for w in words)
+                   for term in terms[1:]):
+                found[pk] = name
+        return sorted(found.items(), key=lambda item: item[1])[:limit]
+
+
+class PublishedLookup:
+    """Published objects by key, cached in-process and in the shared cache.
+
+    Entries are stored under a version number kept in the shared cache;
+    `invalidate()` bumps it, which drops the entries of every process at
+    once. In the steady state a lookup costs one shared cache read and no
+    database queries. Entries are loaded from the primary, also inside
+    `read_from_replica` views: a row read from a lagging replica would be
+    cached under the new version and outlive the lag.
+    """
+
+    # `search()` caches the rows with a word starting with the first
+    # `search_prefix_len` letters of the query, at most `search_rows_max`
+    # of them, under one key per prefix: small entries, and a change only
+    # reloads the prefixes searched again. A prefix with more rows than
+    # that is looked up by the whole first word instead, and if even that
+    # is cut, the query goes to the database with every word.
+    search_prefix_len = 3
+    search_rows_max = 500
+
+    def __init__(self, model, field, search_field=None, max_local=1024):
+        self.model = model
+        self.field = field
+        self.search_field = search_field
+        self.max_local = max_local
+        self.prefix = f'blog:published:{model._meta.model_name}'
+        self._local = OrderedDict()
+        self._local_version = None
+        self._lock = threading.Lock()
+
+    @property
+    def version_key(self):
+        return f'{self.prefix}:version'
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # Start from the clock so that an evicted version key never
+            # brings back entries stored under an old version.
+            version = time.time_ns()
+            if not cache.add(self.version_key, version, timeout=None):
+                version = cache.get(self.version_key, version)
+        return version
+
+    def _cached(self, key, load):
+        version = self.version()
+        with self._lock:
+            if self._local_version != version:
+                self._local.clear()
+                self._local_version = version
+            value = self._local.get(key, _MISSING)
+            if value is not _MISSING:
+                self._local.move_to_end(key)
+                return value
+        cache_key = f'{self.prefix}:{version}:{key}'
+        value = cache.get(cache_key, _MISSING)
+        if value is _MISSING:
+            value = load()
+            cache.set(cache_key, value)
+        with self._lock:
+            if self._local_version == version:
+                self._local[key] = value
+                if len(self._local) > self.max_local:
+                    self._local.popitem(last=False)
+        return value
+
+    def published(self):
+        return self.model.objects.using(DEFAULT_DB_ALIAS).filter(
+            is_published=True
+        )
+
+    def get(self, key):
+        return self._cached(
+            f'obj:{key}',
+            lambda: self.published().filter(**{self.field: key}).first(),
+        )
+
+    def choices(self):
+        """`(pk, label)` pairs of all published objects for select widgets."""
+        return self._cached(
+            'choices',
+            lambda: [(obj.pk, str(obj)) for obj in self.published()],
+        )
+
+    def _search_rows(self, terms, limit):
+        query = self.published()
+        for term in terms:
+            query = query.filter(**{
+                # Matched in Python on SQLite, so Cyrillic folds too.
+                f'{self.search_field}__iregex': rf'(^|\s){re.escape(term)}',
+            })
+        return list(query.order_by(self.search_field).values_list(
+            'pk', self.search_field
+        )[:limit])
+
+    def _search_bucket(self, prefix):
+        return self._cached(
+            # Cache keys must stay ASCII for memcached.
+            f'search:{prefix.encode().hex()}',
+            lambda: self._search_rows([prefix], self.search_rows_max),
+        )
+
+    def search(self, query, limit=20):
+        terms = query.casefold().split()
+        if not terms:
+            return []
+        first = terms[0]
+        rows = self._search_bucket(first[:self.search_prefix_len])
+        if len(rows) >= self.search_rows_max and (
+                len(first) > self.search_prefix_len):
+            rows = self._search_bucket(first)
+        if len(rows) >= self.search_rows_max and len(terms) > 1:
+            rows = self._search_rows(terms, limit)
+        return PrefixIndex(rows).search(query, limit)
+
+    def invalidate(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), timeout=None)
+
+
+class ProfileLookup(PublishedLookup):
+    """Users by username with the fields a profile page shows (no password
+    hash in the cache)."""
+
+    fields = (
+        'username', 'first_name', 'last_name', 'date_joined', 'is_staff',
+    )
+
+    def published(self):
+        return self.model.objects.using(DEFAULT_DB_ALIAS).only(*self.fields)
+
+
+published_categories = PublishedLookup(Category, 'slug')
+published_locations = PublishedLookup(Location, 'pk', search_field='name')
+profiles = ProfileLookup(User, 'username')
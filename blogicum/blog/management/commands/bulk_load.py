@@ -0,0 +1,58 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError
+
+from blog.constants import IMPORT_BATCH_SIZE
+from blog.fixture_import import IMPORT_MODELS, BulkLoader, iter_json_array
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загрузить фикстуру в формате dumpdata (JSON) для моделей'
+        f' {", ".join(IMPORT_MODELS)}: потоковый разбор, пакетные вставки,'
+        ' без сигналов. Связи many-to-many и прочие модели пропускаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixtures', nargs='+', help='Пути к фикстурам; "-" — stdin.'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки, уже существующие в базе.',
+        )
+
+    def handle(self, *args, **options):
+        for path in options['fixtures']:
+            loader = BulkLoader(
+                using=options['database'],
+                batch_size=options['batch_size'],
+                ignore_conflicts=options['ignore_conflicts'],
+            )
+            started = time.perf_counter()
+            try:
+                if path == '-':
+                    loaded = loader.load(iter_json_array(sys.stdin))
+                else:
+                    with open(path, encoding='utf-8') as fixture:
+                        loaded = loader.load(iter_json_array(fixture))
+            except FileNotFoundError:
+                raise CommandError(f'Фикстура {path} не найдена.')
+            except (ValueError, IntegrityError) as error:
+                raise CommandError(f'Ошибка загрузки {path}: {error}')
+            elapsed = time.perf_counter() - started
+            total = sum(loaded.values())
+            for model, count in loaded.items():
+                self.stdout.write(f'{model._meta.label}: {count}')
+            for label, count in sorted(loader.skipped.items()):
+                self.stdout.write(f'{label}: {count} (пропущено)')
+            self.stdout.write(
+                f'{path}: {total} строк за {elapsed:.2f} с'
+                f' ({total / elapsed if elapsed else 0:.0f} строк/с).'
+            )
@@ -0,0 +1,81 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.export import EXPORTS, FORMATS, csv_header, iter_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгрузить публикации или комментарии в NDJSON или CSV'
+        ' потоком, с возможностью продолжить с контрольной точки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=EXPORTS)
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument(
+            '--output', help='Файл выгрузки; по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--after', type=int,
+            help='Выгружать записи с id больше указанного.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл с id последней выгруженной записи; при повторном'
+                 ' запуске выгрузка продолжится с него.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+
+    def read_checkpoint(self, path):
+        try:
+            with open(path, encoding='utf-8') as checkpoint:
+                return int(checkpoint.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError(f'Повреждена контрольная точка {path}.')
+
+    def write_checkpoint(self, path, last_id):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as checkpoint:
+            checkpoint.write(str(last_id))
+        os.replace(tmp_path, path)
+
+    def handle(self, *args, **options):
+        after = options['after']
+        if after is None:
+            after = 0
+            if options['checkpoint']:
+                after = self.read_checkpoint(options['checkpoint'])
+        if options['output']:
+            # A resumed export appends to what the previous run wrote.
+            output = open(
+                options['output'], 'a' if after else 'w',
+                encoding='utf-8', newline='',
+            )
+        else:
+            output = self.stdout
+        lines, _ = FORMATS[options['format']]
+        exported = 0
+        try:
+            if options['format'] == 'csv' and not after:
+                output.writelines([csv_header(options['name'])])
+            for chunk in iter_chunks(
+                options['name'], after, options['chunk_size']
+            ):
+                output.writelines(lines(chunk))
+                output.flush()
+                exported += len(chunk)
+                if options['checkpoint']:
+                    self.write_checkpoint(
+                        options['checkpoint'], chunk[-1]['id']
+                    )
+        finally:
+            if output is not self.stdout:
+                output.close()
+        self.stderr.write(f'Выгружено записей: {exported}.')
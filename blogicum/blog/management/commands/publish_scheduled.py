@@ -0,0 +1,49 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.scheduler import PublicationScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправлять событие post_published для отложенных публикаций в'
+        ' момент наступления их даты. При запуске сначала публикуются'
+        ' записи, время которых наступило, пока команда не работала.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Опубликовать наступившие записи и выйти (для cron).',
+        )
+        parser.add_argument(
+            '--watermark', default=settings.PUBLICATION_WATERMARK,
+            help='Файл с моментом, до которого события уже отправлены.',
+        )
+        parser.add_argument(
+            '--poll', type=float, default=settings.PUBLICATION_POLL_SECONDS,
+            help='Как часто (в секундах) искать новые отложенные записи.',
+        )
+
+    def handle(self, *args, **options):
+        poll = timedelta(seconds=options['poll'])
+        scheduler = PublicationScheduler(
+            options['watermark'], lookahead=poll.total_seconds()
+        )
+        while True:
+            now = timezone.now()
+            for post in scheduler.tick(now):
+                self.stdout.write(
+                    f'Опубликовано: #{post.pk} «{post}»'
+                    f' ({post.pub_date:%Y-%m-%d %H:%M})'
+                )
+            if options['once']:
+                return
+            wake = now + poll
+            if scheduler.next_due() is not None:
+                wake = min(wake, scheduler.next_due())
+            time.sleep(max((wake - timezone.now()).total_seconds(), 0))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитать статистику авторов (число публикаций и комментариев,'
+        ' дата последней публикации) для всех пользователей.'
+    )
+
+    def handle(self, *args, **options):
+        count = stats.rebuild()
+        self.stdout.write(f'Пересчитана статистика пользователей: {count}')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import feed
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобрать ленту главной страницы из публикаций, например после'
+        ' изменений в базе в обход ORM.'
+    )
+
+    def handle(self, *args, **options):
+        count = feed.rebuild()
+        self.stdout.write(f'Записей в ленте: {count}')
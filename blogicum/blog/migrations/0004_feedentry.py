@@ -0,0 +1,80 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:50
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils.text import Truncator
+import django.db.models.deletion
+
+
+def fill_feed(apps, schema_editor):
+    # Same rows as `blog.feed.rebuild()`, built from historical models.
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+    ).select_related(
+        'author', 'category', 'location'
+    ).annotate(
+        comment_count=Count('comments')
+    )
+    FeedEntry.objects.bulk_create((
+        FeedEntry(
+            post_id=post.pk,
+            pub_date=post.pub_date,
+            title=post.title,
+            excerpt=Truncator(post.text).words(10, truncate=' …'),
+            image=post.image.name or '',
+            author_username=post.author.username,
+            category_id=post.category_id,
+            category_slug=post.category.slug,
+            category_title=post.category.title,
+            location_name=(
+                post.location.name
+                if post.location and post.location.is_published else None
+            ),
+            comment_count=post.comment_count,
+        )
+        for post in posts.iterator()
+    ), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_auto_20240606_1155'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='blog.location', verbose_name='Местоположение'),
+        ),
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post')),
+                ('pub_date', models.DateTimeField()),
+                ('title', models.CharField(blank=True, max_length=256)),
+                ('excerpt', models.TextField()),
+                ('image', models.CharField(blank=True, max_length=100)),
+                ('author_username', models.CharField(max_length=150)),
+                ('category_slug', models.SlugField(db_index=False)),
+                ('category_title', models.CharField(max_length=256)),
+                ('location_name', models.CharField(blank=True, max_length=256, null=True)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date', '-post_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='blog_feed_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
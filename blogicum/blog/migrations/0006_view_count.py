@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_authorstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedentry',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Обновляется пакетами, см. blog.view_counts.', verbose_name='Просмотры'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:21
+
+from django.db import migrations, models
+from django.db.models import Min
+from django.utils import timezone
+
+
+def fill_next_publication(apps, schema_editor):
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Post = apps.get_model('blog', 'Post')
+    rows = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=timezone.now(),
+    ).values('author_id').annotate(next=Min('pub_date')).order_by()
+    for row in rows:
+        AuthorStats.objects.filter(user_id=row['author_id']).update(
+            next_publication=row['next']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authorstats',
+            name='next_publication',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_next_publication, migrations.RunPython.noop),
+    ]
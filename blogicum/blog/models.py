@@ -1,10 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.conf import settings
 from django.db import models
-from django.urls import reverse
 
 from .constants import PRE_TEXT_LEN
-from .managers import NewPostManager
+from .managers import PostQuerySet
+from .reverse import fast_reverse
 
 User = get_user_model()
 
@@ -104,9 +104,14 @@ class Post(BaseBlogModel):
         upload_to='posts_images',
         blank=True,
     )
+    view_count = models.PositiveIntegerField(
+        'Просмотры',
+        default=0,
+        editable=False,
+        help_text='Обновляется пакетами, см. blog.view_counts.',
+    )
 
-    objects = models.Manager()
-    published_manager = NewPostManager()
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
@@ -116,8 +121,28 @@ class Post(BaseBlogModel):
     def __str__(self):
         return self.title[:PRE_TEXT_LEN]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        # What was loaded, so that receivers can tell what a save changes.
+        post._loaded_values = dict(zip(field_names, values))
+        return post
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        # view_count is only changed by blog.view_counts with F() updates:
+        # saving the loaded value back would undo a flush made meanwhile.
+        # An INSERT (no row to update) still writes it.
+        if update_fields is None:
+            values = [
+                value for value in values if value[0].name != 'view_count'
+            ]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
+
     def get_absolute_url(self):
-        return reverse('blog:post_detail', kwargs={"post_id": self.pk})
+        return fast_reverse('blog:post_detail', kwargs={'post_id': self.pk})
 
 
 class Comment(models.Model):
@@ -142,3 +167,93 @@ class Comment(models.Model):
     def __str__(self):
         comment_preview = self.text[:PRE_TEXT_LEN]
         return f'{self.post} ({self.author}) - "{comment_preview}..."'
+
+
+class FeedEntry(models.Model):
+    """Index page card of a published post, maintained by `blog.feed`."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+    )
+    pub_date = models.DateTimeField()
+    title = models.CharField(max_length=settings.MAXLENGTH, blank=True)
+    excerpt = models.TextField()
+    image = models.CharField(max_length=100, blank=True)
+    author_username = models.CharField(max_length=150)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    category_slug = models.SlugField(db_index=False)
+    category_title = models.CharField(max_length=settings.MAXLENGTH)
+    location_name = models.CharField(
+        max_length=settings.MAXLENGTH,
+        null=True,
+        blank=True,
+    )
+    comment_count = models.PositiveIntegerField(default=0)
+    view_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        ordering = ('-pub_date', '-post_id')
+        indexes = [
+            models.Index(
+                fields=('-pub_date', '-post'), name='blog_feed_pub_date_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.title[:PRE_TEXT_LEN]
+
+    def as_post(self):
+        """Unsaved `Post` with what the post card template renders."""
+        post = Post(
+            id=self.post_id,
+            title=self.title,
+            text=self.excerpt,
+            pub_date=self.pub_date,
+            image=self.image,
+            is_published=True,
+        )
+        post.author = User(username=self.author_username)
+        post.category = Category(
+            id=self.category_id,
+            slug=self.category_slug,
+            title=self.category_title,
+            is_published=True,
+        )
+        if self.location_name is not None:
+            post.location = Location(name=self.location_name,
+                                     is_published=True)
+        post.comment_count = self.comment_count
+        post.view_count = self.view_count
+        return post
+
+
+class AuthorStats(models.Model):
+    """Post and comment totals of a user, maintained by `blog.stats`."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    published_posts = models.PositiveIntegerField(default=0)
+    total_posts = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    last_post_date = models.DateTimeField(null=True, blank=True)
+    next_publication = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return str(self.user)
@@ -0,0 +1,103 @@
+"""Publication events for posts with a future `pub_date`.
+
+`PostQuerySet.published()` hides such posts until their time comes, but nothing
+happens at that moment. `PublicationScheduler` keeps the upcoming
+publications in a heap ordered by `pub_date` and sends `post_published`
+for each post once its `pub_date` has passed (`manage.py
+publish_scheduled`).
+
+Upcoming posts are read from the `(pub_date, post)` index of the feed,
+which holds every published post of a published category, future ones
+included. The watermark, the moment up to which events have been sent,
+is saved to a file after every batch, so a restarted scheduler first
+publishes whatever went live while it was down and never sends an event
+twice for the same `pub_date` (unless it dies between sending and saving).
+"""
+import heapq
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .models import FeedEntry, Post
+from .signals import post_published
+
+
+class PublicationScheduler:
+
+    def __init__(self, watermark_path, lookahead):
+        self.path = Path(watermark_path)
+        self.lookahead = timedelta(seconds=lookahead)
+        self.heap = []
+        self.queued = set()
+        self.watermark = self.read_watermark()
+
+    def read_watermark(self):
+        try:
+            value = self.path.read_text().strip()
+        except FileNotFoundError:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ImproperlyConfigured(
+                f'Invalid publication watermark {value!r} in {self.path}.'
+            )
+
+    def save_watermark(self):
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        temporary.write_text(self.watermark.isoformat())
+        temporary.replace(self.path)
+
+    def poll(self, now):
+        """Queue posts going live after the watermark and before the horizon.
+
+        On the very first run the watermark starts at `now`: posts
+        published earlier are not announced.
+        """
+        if self.watermark is None:
+            self.watermark = now
+            self.save_watermark()
+        upcoming = FeedEntry.objects.filter(
+            pub_date__gt=self.watermark,
+            pub_date__lte=now + self.lookahead,
+        ).values_list('pub_date', 'post_id')
+        for item in upcoming:
+            if item not in self.queued:
+                self.queued.add(item)
+                heapq.heappush(self.heap, item)
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def publish_due(self, now):
+        """Send `post_published` for queued posts due by `now`.
+
+        A post is skipped if it was unpublished, deleted or rescheduled
+        since it was queued; a new `pub_date` is queued by the next poll.
+        Returns the published posts in `pub_date` order.
+        """
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            item = heapq.heappop(self.heap)
+            self.queued.discard(item)
+            due.append(item)
+        live = []
+        if due:
+            current = set(FeedEntry.objects.filter(
+                post_id__in=[pk for _, pk in due]
+            ).values_list('pub_date', 'post_id'))
+            live = [item for item in due if item in current]
+        posts = Post.objects.for_feed().in_bulk([pk for _, pk in live])
+        published = []
+        for _, pk in live:
+            if pk in posts:
+                post_published.send(sender=Post, instance=posts[pk])
+                published.append(posts[pk])
+        self.watermark = max(self.watermark, now)
+        self.save_watermark()
+        return published
+
+    def tick(self, now):
+        self.poll(now)
+        return self.publish_due(now)
@@ -0,0 +1,283 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from . import feed, stats
+from .lookups import profiles, published_categories, published_locations
+from .models import Category, Comment, FeedEntry, Location, Post, User
+
+# Sent once after a set-based update, delete or load (see `blog.bulk`,
+# `blog.fixture_import`), which bypasses `post_save`; takes `sender` (the
+# model), `using` and `pks`, the affected primary keys or None if unknown.
+bulk_changed = Signal()
+
+# Sent by `blog.bulk.bulk_delete` inside its transaction before `rows`, a
+# queryset of `sender`, are deleted without `pre_delete` and `post_delete`;
+# takes `sender`, `using` and `rows`. A receiver may return a callable to
+# run once the rows are gone.
+bulk_deleting = Signal()
+
+# Sent by `blog.scheduler` when a post's `pub_date` passes and it becomes
+# visible; takes `sender` (`Post`) and `instance`.
+post_published = Signal()
+
+# Sent by `blog.comment_batcher` inside the transaction that bulk-inserted
+# `comments`, which bypasses `post_save`; takes `sender` (`Comment`) and
+# `comments`.
+comments_created = Signal()
+
+
+def counts_by(rows, field):
+    """Values of `field` among `rows` grouped by how many rows have them,
+    for one UPDATE per distinct count."""
+    groups = defaultdict(list)
+    for value, count in rows.values(field).annotate(
+        count=Count('pk')
+    ).order_by().values_list(field, 'count'):
+        groups[count].append(value)
+    return groups.items()
+
+
+def invalidate_now_and_on_commit(lookup):
+    # The second bump drops anything another process cached from the
+    # database between the first one and the commit.
+    lookup.invalidate()
+    transaction.on_commit(lookup.invalidate)
+
+
+@receiver(bulk_changed, sender=Category)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(**kwargs):
+    invalidate_now_and_on_commit(published_categories)
+
+
+@receiver(bulk_changed, sender=Location)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_locations(**kwargs):
+    invalidate_now_and_on_commit(published_locations)
+
+
+@receiver(bulk_changed, sender=User)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profiles(update_fields=None, **kwargs):
+    # Logging in only touches `last_login`, which profiles do not show.
+    if update_fields is None or set(update_fields) & set(profiles.fields):
+        invalidate_now_and_on_commit(profiles)
+
+
+@receiver(post_save, sender=Post)
+def refresh_feed_post(instance, raw=False, **kwargs):
+    if not raw:
+        feed.refresh_posts([instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+def count_feed_comment(instance, created, raw=False, **kwargs):
+    if created and not raw:
+        FeedEntry.objects.filter(post_id=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(comments_created)
+def count_feed_comments(comments, **kwargs):
+    for post_id, count in Counter(c.post_id for c in comments).items():
+        FeedEntry.objects.filter(post_id=post_id).update(
+            comment_count=F('comment_count') + count
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_feed_comment(instance, **kwargs):
+    FeedEntry.objects.filter(
+        post_id=instance.post_id, comment_count__gt=0
+    ).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(bulk_deleting, sender=Comment)
+def uncount_feed_comments(rows, **kwargs):
+    for count, post_ids in counts_by(rows, 'post_id'):
+        FeedEntry.objects.filter(post_id__in=post_ids).update(
+            comment_count=Greatest(F('comment_count') - count, 0)
+        )
+
+
+@receiver(post_save, sender=Category)
+def refresh_feed_category(instance, raw=False, **kwargs):
+    if not raw:
+        feed.refresh_posts(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Location)
+def refresh_feed_location(instance, raw=False, **kwargs):
+    if not raw:
+        feed.refresh_posts(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Location)
+def drop_feed_location(**kwargs):
+    # The posts were detached from the location before this is sent.
+    feed.refresh_posts(Post.objects.filter(
+        location__isnull=True, feed_entry__location_name__isnull=False,
+    ).values_list('pk', flat=True))
+
+
+@receiver(bulk_deleting, sender=Location)
+def drop_feed_locations(rows, **kwargs):
+    pks = list(Post.objects.filter(
+        location__in=rows
+    ).values_list('pk', flat=True))
+    return lambda: feed.refresh_posts(pks)
+
+
+@receiver(post_save, sender=User)
+def rename_feed_author(instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and 'username' not in update_fields):
+        return
+    FeedEntry.objects.filter(post__author=instance).exclude(
+        author_username=instance.username
+    ).update(author_username=instance.username)
+
+
+@receiver(bulk_changed)
+def refresh_feed_bulk(sender, pks=None, **kwargs):
+    if sender not in (Post, Comment, Category, Location, User):
+        return
+    if pks is None:
+        feed.rebuild()
+    elif sender is Post:
+        feed.refresh_posts(pks)
+    else:
+        field = {
+            Comment: 'comments', Category: 'category',
+            Location: 'location', User: 'author',
+        }[sender]
+        feed.refresh_posts(Post.objects.filter(
+            **{f'{field}__in': pks}
+        ).values_list('pk', flat=True).distinct())
+
+
+# Post fields the author totals depend on; other edits keep them.
+POST_STATS_FIELDS = ('author_id', 'category_id', 'is_published', 'pub_date')
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_stats_fields(instance, raw=False, **kwargs):
+    # Posts loaded from the database already know their stored values.
+    if raw or instance.pk is None or hasattr(instance, '_loaded_values'):
+        return
+    instance._loaded_values = Post.objects.filter(
+        pk=instance.pk
+    ).values(*POST_STATS_FIELDS).first() or {}
+
+
+@receiver(post_save, sender=Post)
+def refresh_post_author_stats(instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = {} if created else getattr(instance, '_loaded_values', {})
+    current = {name: getattr(instance, name) for name in POST_STATS_FIELDS}
+    instance._loaded_values = {**loaded, **current}
+    if not created and all(
+        name in loaded and loaded[name] == value
+        for name, value in current.items()
+    ):
+        return
+    stats.refresh_authors(
+        {instance.author_id, loaded.get('author_id')} - {None}
+    )
+
+
+@receiver(post_delete, sender=Post)
+def uncount_post_author_stats(instance, **kwargs):
+    # The author may be being deleted too: do not recreate their row.
+    stats.refresh_authors([instance.author_id], create=False)
+
+
+@receiver(bulk_deleting, sender=Post)
+def uncount_post_authors_stats(rows, **kwargs):
+    authors = list(rows.values_list('author_id', flat=True).distinct())
+    return lambda: stats.refresh_authors(authors, create=False)
+
+
+@receiver(post_published, sender=Post)
+def count_published_post(instance, **kwargs):
+    stats.refresh_authors([instance.author_id])
+
+
+@receiver(post_save, sender=Comment)
+def count_author_comment(instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.add_comment(instance.author_id)
+
+
+@receiver(comments_created)
+def count_author_comments(comments, **kwargs):
+    for author_id, count in Counter(c.author_id for c in comments).items():
+        stats.add_comment(author_id, count)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_author_comment(instance, **kwargs):
+    stats.remove_comment(instance.author_id)
+
+
+@receiver(bulk_deleting, sender=Comment)
+def uncount_author_comments(rows, **kwargs):
+    for count, author_ids in counts_by(rows, 'author_id'):
+        stats.remove_comments(author_ids, count)
+
+
+def category_authors(categories):
+    return Post.objects.filter(
+        category__in=categories
+    ).values_list('author_id', flat=True).distinct()
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_author_stats(instance, raw=False, **kwargs):
+    if not raw:
+        stats.refresh_authors(category_authors([instance]))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_authors(instance, **kwargs):
+    # The posts lose their category before `post_delete` is sent.
+    instance._authors = list(category_authors([instance]))
+
+
+@receiver(post_delete, sender=Category)
+def refresh_deleted_category_author_stats(instance, **kwargs):
+    stats.refresh_authors(getattr(instance, '_authors', ()))
+
+
+@receiver(bulk_deleting, sender=Category)
+def refresh_deleted_categories_author_stats(rows, **kwargs):
+    authors = list(category_authors(rows))
+    return lambda: stats.refresh_authors(authors)
+
+
+@receiver(bulk_changed)
+def refresh_author_stats_bulk(sender, pks=None, **kwargs):
+    if sender not in (Post, Comment, Category, User):
+        return
+    if pks is None:
+        stats.rebuild()
+    elif sender is User:
+        stats.refresh_authors(pks)
+    elif sender is Category:
+        stats.refresh_authors(category_authors(pks))
+    else:
+        # Deleted rows were counted by the `bulk_deleting` receivers.
+        stats.refresh_authors(sender.objects.filter(
+            pk__in=pks
+        ).values_list('author_id', flat=True).distinct())
@@ -0,0 +1,152 @@
+"""Per-author totals shown on the profile page: one `AuthorStats` row each.
+
+Comment totals are adjusted in place as comments come and go; post
+totals are recounted for the authors whose posts (or their categories)
+changed, and when a scheduled post goes live (`post_published`), so a
+profile never counts posts itself. Each row also keeps the time its
+next scheduled post goes live: `get()` recounts a row whose time has
+passed, so the totals stay right without `publish_scheduled` running.
+`rebuild()` (`manage.py rebuild_author_stats`) recomputes everything.
+
+Every read here goes to the primary, also inside `read_from_replica`
+views: totals counted on a lagging replica would be written back over
+the right ones.
+"""
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .constants import BULK_BATCH_SIZE
+from .managers import published_q
+from .models import AuthorStats, Comment, Post, User
+
+
+STATS_FIELDS = ('published_posts', 'total_posts', 'comments',
+                'last_post_date', 'next_publication')
+
+
+def compute(user_ids):
+    """Unsaved `AuthorStats` of the existing users among `user_ids`."""
+    posts = {
+        row['author_id']: row
+        for row in Post.objects.using(DEFAULT_DB_ALIAS).filter(
+            author_id__in=user_ids,
+        ).values('author_id').annotate(
+            total_posts=Count('pk'),
+            published_posts=Count('pk', filter=published_q()),
+            last_post_date=Max('pub_date', filter=published_q()),
+            next_publication=Min('pub_date', filter=Q(
+                is_published=True,
+                category__is_published=True,
+                pub_date__gt=timezone.now(),
+            )),
+        ).order_by()
+    }
+    comments = dict(
+        Comment.objects.using(DEFAULT_DB_ALIAS).filter(
+            author_id__in=user_ids,
+        ).values('author_id').annotate(
+            count=Count('pk')
+        ).order_by().values_list('author_id', 'count')
+    )
+    empty = {
+        'total_posts': 0, 'published_posts': 0,
+        'last_post_date': None, 'next_publication': None,
+    }
+    return [
+        AuthorStats(
+            user_id=user_id,
+            total_posts=posts.get(user_id, empty)['total_posts'],
+            published_posts=posts.get(user_id, empty)['published_posts'],
+            last_post_date=posts.get(user_id, empty)['last_post_date'],
+            next_publication=posts.get(user_id, empty)['next_publication'],
+            comments=comments.get(user_id, 0),
+        )
+        for user_id in User.objects.using(DEFAULT_DB_ALIAS).filter(
+            pk__in=user_ids
+        ).values_list('pk', flat=True)
+    ]
+
+
+def refresh_authors(user_ids, create=True):
+    """Recount the stats of users `user_ids`; returns the new rows.
+
+    With `create=False` only existing rows are recounted, e.g. while the
+    deletion of a user cascades to their posts and stats.
+    """
+    user_ids = sorted(set(user_ids))
+    created = []
+    for start in range(0, len(user_ids), BULK_BATCH_SIZE):
+        batch = user_ids[start:start + BULK_BATCH_SIZE]
+        with transaction.atomic():
+            # Lock the rows before counting and update them in place, so
+            # that an `add_comment()` made meanwhile waits and then adds
+            # to the new totals instead of being overwritten.
+            existing = set(AuthorStats.objects.using(
+                DEFAULT_DB_ALIAS
+            ).select_for_update().filter(
+                user_id__in=batch
+            ).values_list('user_id', flat=True))
+            if not create:
+                batch = [user_id for user_id in batch if user_id in existing]
+            rows = compute(batch)
+            AuthorStats.objects.bulk_update(
+                [row for row in rows if row.user_id in existing],
+                STATS_FIELDS,
+            )
+            AuthorStats.objects.bulk_create(
+                [row for row in rows if row.user_id not in existing]
+            )
+        created += rows
+    return created
+
+
+def add_comment(user_id, count=1):
+    # Users without a row yet are counted in full by `get()`.
+    AuthorStats.objects.filter(user_id=user_id).update(
+        comments=F('comments') + count
+    )
+
+
+def remove_comment(user_id):
+    AuthorStats.objects.filter(user_id=user_id, comments__gt=0).update(
+        comments=F('comments') - 1
+    )
+
+
+def remove_comments(user_ids, count):
+    AuthorStats.objects.filter(user_id__in=user_ids).update(
+        comments=Greatest(F('comments') - count, 0)
+    )
+
+
+def get(user):
+    """Stats of `user`, counted on the spot if there are none yet or a
+    scheduled post has gone live since."""
+    try:
+        row = AuthorStats.objects.using(DEFAULT_DB_ALIAS).get(
+            user_id=user.pk
+        )
+    except AuthorStats.DoesNotExist:
+        return refresh_authors([user.pk])[0]
+    if row.next_publication and row.next_publication <= timezone.now():
+        return refresh_authors([user.pk])[0]
+    return row
+
+
+def visible_posts(row, viewer):
+    """How many posts of `row`'s user `viewer` sees on the profile, as
+    `Post.objects.visible_to(viewer)` would count them."""
+    if viewer is not None and viewer.pk == row.user_id:
+        return row.total_posts
+    return row.published_posts
+
+
+def rebuild():
+    with transaction.atomic():
+        AuthorStats.objects.all().delete()
+        refresh_authors(User.objects.using(DEFAULT_DB_ALIAS).values_list(
+            'pk', flat=True
+        ))
+    return AuthorStats.objects.using(DEFAULT_DB_ALIAS).count()
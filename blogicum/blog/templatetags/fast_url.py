@@ -0,0 +1,37 @@
+from django import template
+from django.template.defaulttags import URLNode, url as url_tag
+from django.urls import NoReverseMatch
+from django.utils.html import conditional_escape
+
+from blog.reverse import fast_reverse
+
+register = template.Library()
+
+
+class FastURLNode(URLNode):
+    def render(self, context):
+        args = [arg.resolve(context) for arg in self.args]
+        kwargs = {
+            key: value.resolve(context)
+            for key, value in self.kwargs.items()
+        }
+        view_name = self.view_name.resolve(context)
+        url = ''
+        try:
+            url = fast_reverse(view_name, args=args, kwargs=kwargs)
+        except NoReverseMatch:
+            if self.asvar is None:
+                raise
+        if self.asvar:
+            context[self.asvar] = url
+            return ''
+        if context.autoescape:
+            url = conditional_escape(url)
+        return url
+
+
+@register.tag
+def url(parser, token):
+    """Drop-in `{% url %}` that resolves through `fast_reverse`."""
+    node = url_tag(parser, token)
+    return FastURLNode(node.view_name, node.args, node.kwargs, node.asvar)
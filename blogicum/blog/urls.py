@@ -1,12 +1,26 @@
+from django.conf import settings
 from django.urls import include, path
 
 from . import views
 
 app_name = 'blog'
 
+if settings.ASYNC_VIEWS:
+    from . import async_views
+
+    index_view = async_views.index
+    category_view = async_views.category_posts
+    profile_view = async_views.profile
+    post_detail_view = async_views.post_detail
+else:
+    index_view = views.BlogListView.as_view()
+    category_view = views.CategoryListView.as_view()
+    profile_view = views.get_profile
+    post_detail_view = views.PostDetailView.as_view()
+
 posts_urls = [
     path('<int:post_id>/',
-         views.PostDetailView.as_view(),
+         post_detail_view,
          name='post_detail'),
     path('create/',
          views.PostCreateView.as_view(),
@@ -30,16 +44,22 @@ posts_urls = [
 
 urlpatterns = [
     path('category/<slug:category_slug>/',
-         views.CategoryListView.as_view(),
+         category_view,
          name='category_posts'),
     path('profile/<str:username>/',
-         views.get_profile,
+         profile_view,
          name='profile'),
     path('edit_profile/',
          views.edit_profile,
          name='edit_profile'),
+    path('locations/autocomplete/',
+         views.location_autocomplete,
+         name='location_autocomplete'),
+    path('export/<slug:name>/',
+         views.export_data,
+         name='export'),
     path('',
-         views.BlogListView.as_view(),
+         index_view,
          name='index'),
     path('posts/', include(posts_urls)),
 ]
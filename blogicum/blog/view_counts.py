@@ -0,0 +1,167 @@
+"""Post view counts with buffered write-back.
+
+An UPDATE per page view would make every read a write. `ViewCounter.hit()`
+only adds the view to a counter in process memory; a background thread
+writes the accumulated deltas every `VIEW_COUNT_FLUSH_SECONDS` seconds,
+or sooner once `VIEW_COUNT_MAX_PENDING` views are waiting. A flush is one
+transaction with one UPDATE of `Post.view_count` and one of
+`FeedEntry.view_count` per distinct delta, `WHERE id IN (...)`, so the
+cost depends on the number of viewed posts, not of views.
+
+A worker that exits normally flushes its counter; a killed one loses at
+most the views of one interval, never more than
+`VIEW_COUNT_MAX_PENDING`. Views that could not be written are kept for
+the next flush up to the same limit; the rest are dropped with a
+warning, so a database outage does not grow the counter without bound.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F
+
+from .models import FeedEntry, Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+
+    def __init__(self, interval=None, max_pending=None):
+        self._interval = interval
+        self._max_pending = max_pending
+        self._pending = Counter()
+        self._total = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def interval(self):
+        """Seconds between flushes; with `None` the thread only writes
+        once `max_pending` views are waiting."""
+        if self._interval is not None:
+            return self._interval
+        return getattr(settings, 'VIEW_COUNT_FLUSH_SECONDS', 10)
+
+    @property
+    def max_pending(self):
+        if self._max_pending is not None:
+            return self._max_pending
+        return getattr(settings, 'VIEW_COUNT_MAX_PENDING', 1000)
+
+    def hit(self, post_id):
+        """Count a view of the post; returns its views not yet written."""
+        with self._lock:
+            self._pending[post_id] += 1
+            self._total += 1
+            pending = self._pending[post_id]
+            full = self._total >= self.max_pending
+        self._start()
+        if full:
+            self._wake.set()
+        return pending
+
+    def pending(self, post_id):
+        """Views of the post counted here but not written yet."""
+        with self._lock:
+            return self._pending[post_id]
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name='view-counter', daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread and write what is pending."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None and thread.is_alive():
+            self._wake.set()
+            thread.join()
+        self.flush()
+
+    def reset(self):
+        """Drop pending views without writing them."""
+        with self._lock:
+            self._pending.clear()
+            self._total = 0
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            # Replace a broken or expired connection before each flush.
+            close_old_connections()
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception('Post view counts were not written.')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write pending views to the database; returns the posts updated.
+
+        If the transaction fails the views are kept for the next flush,
+        at most `max_pending` of them.
+        """
+        with self._lock:
+            deltas, self._pending = self._pending, Counter()
+            self._total = 0
+        if not deltas:
+            return 0
+        by_delta = defaultdict(list)
+        for post_id, delta in deltas.items():
+            by_delta[delta].append(post_id)
+        try:
+            with transaction.atomic():
+                for delta, post_ids in sorted(by_delta.items()):
+                    Post.objects.filter(pk__in=post_ids).update(
+                        view_count=F('view_count') + delta
+                    )
+                    FeedEntry.objects.filter(post_id__in=post_ids).update(
+                        view_count=F('view_count') + delta
+                    )
+        except DatabaseError:
+            self._restore(deltas)
+            raise
+        with self._lock:
+            self.flushes += 1
+            self.written += sum(deltas.values())
+        return len(deltas)
+
+    def _restore(self, deltas):
+        """Put unwritten `deltas` back, keeping at most `max_pending`."""
+        with self._lock:
+            room = max(self.max_pending - self._total, 0)
+            kept = 0
+            for post_id, delta in deltas.most_common():
+                delta = min(delta, room - kept)
+                if delta <= 0:
+                    break
+                self._pending[post_id] += delta
+                kept += delta
+            self._total += kept
+            dropped = sum(deltas.values()) - kept
+            self.dropped += dropped
+        if dropped:
+            logger.warning(
+                'Dropped %d post views that could not be written.', dropped
+            )
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.stop)
@@ -1,7 +1,12 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy, reverse
 from django.views.generic import (
@@ -9,28 +14,43 @@ from django.views.generic import (
 )
 
 from blogicum.settings import PAGINATOR
+from perf.ratelimit import RateLimitMixin, ratelimit
+from perf.replicas import ReplicaReadMixin, read_from_replica
+from . import feed, stats
+from .comment_batcher import comment_batcher
+from .export import EXPORTS, FORMATS, stream
 from .forms import ProfileEditForm, PostForm, CommentForm
-from .models import Category, Comment, Post, User
+from .lookups import profiles, published_categories, published_locations
+from .models import Comment, Post
 from .mixins import OnlyAuthorMixin
-from .service import get_posts
+from .view_counts import view_counter
 
 
-class BlogListView(ListView):
-    model = Post
+class BlogListView(ReplicaReadMixin, ListView):
     template_name = 'blog/index.html'
-    queryset = get_posts(Post).annotate(comment_count=Count('comments'))
-    ordering = '-pub_date'
     paginate_by = PAGINATOR
+    context_object_name = 'post_list'
+
+    def get_queryset(self):
+        return feed.visible_entries()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, entries, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        page.object_list = [entry.as_post() for entry in entries]
+        return paginator, page, page.object_list, is_paginated
 
 
-class CategoryListView(ListView):
+class CategoryListView(ReplicaReadMixin, ListView):
     paginate_by = PAGINATOR
     template_name = 'blog/category.html'
 
     def get_object(self):
-        return get_object_or_404(Category,
-                                 slug=self.kwargs['category_slug'],
-                                 is_published=True)
+        category = published_categories.get(self.kwargs['category_slug'])
+        if category is None:
+            raise Http404('No Category matches the given query.')
+        return category
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -38,36 +58,29 @@ class CategoryListView(ListView):
         return context
 
     def get_queryset(self):
-        page_obj = get_posts(Post).filter(
-            category=self.get_object(),
-        ).annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
-        return page_obj
+        return Post.objects.published().filter(
+            category_id=self.get_object().pk,
+        ).for_feed().with_comment_counts()
 
 
+@read_from_replica
 def get_profile(request, username):
-    profile = get_object_or_404(User, username=username)
-    user_posts = profile.posts.select_related(
-        'author',
-        'category',
-        'location',
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
-    if request.user != profile:
-        user_posts = get_posts(Post).annotate(
-            comment_count=Count('comments')
-        ).filter(
-            author=profile,
-        ).order_by('-pub_date')
+    profile = profiles.get(username)
+    if profile is None:
+        raise Http404('No User matches the given query.')
+    user_posts = Post.objects.visible_to(request.user).filter(
+        author_id=profile.pk,
+    ).for_feed().with_comment_counts()
+    author_stats = stats.get(profile)
 
     paginator = Paginator(user_posts, PAGINATOR)
+    paginator.count = stats.visible_posts(author_stats, request.user)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
     context = {
         'profile': profile,
+        'stats': author_stats,
         'page_obj': page_obj,
     }
     return render(request, 'blog/profile.html', context)
@@ -83,9 +96,30 @@ def edit_profile(request):
 
 
 @login_required
+@ratelimit('comment')
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
+    if settings.COMMENT_GROUP_COMMIT and form.is_valid():
+        comment = form.save(commit=False)
+        comment.author = request.user
+        comment.post_id = post_id
+        try:
+            comment_batcher.submit(comment)
+        except Post.DoesNotExist:
+            raise Http404('No Post matches the given query.')
+        except TimeoutError:
+            # The comment was withdrawn unsaved: a retry adds no duplicate.
+            response = HttpResponse(
+                'Сервер перегружен, попробуйте отправить комментарий ещё раз.',
+                status=503,
+                content_type='text/plain; charset=utf-8',
+            )
+            response['Retry-After'] = '1'
+            return response
+        return redirect('blog:post_detail', post_id=post_id)
+    post = get_object_or_404(
+        Post.objects.visible_to(request.user), id=post_id
+    )
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
@@ -95,6 +129,36 @@ def add_comment(request, post_id):
     return render(request, 'blog/detail.html', {'form': form, 'post': post})
 
 
+@login_required
+def location_autocomplete(request):
+    results = published_locations.search(request.GET.get('q', ''))
+    return JsonResponse({
+        'results': [{'id': pk, 'name': name} for pk, name in results],
+    })
+
+
+@staff_member_required
+def export_data(request, name):
+    if name not in EXPORTS:
+        raise Http404('Unknown export.')
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in FORMATS:
+        return HttpResponseBadRequest('Unknown format.')
+    try:
+        after = int(request.GET.get('after', 0))
+    except ValueError:
+        return HttpResponseBadRequest('`after` must be an integer.')
+    _, content_type = FORMATS[export_format]
+    response = StreamingHttpResponse(
+        stream(name, export_format, after),
+        content_type=f'{content_type}; charset=utf-8',
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{name}.{export_format}"'
+    )
+    return response
+
+
 class CommentUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
     model = Comment
     form_class = CommentForm
@@ -111,19 +175,19 @@ class CommentDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     success_url = reverse_lazy('blog:index')
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ReplicaReadMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     context_object_name = 'post'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user).for_feed()
+
     def get_object(self, queryset=None):
-        post = super().get_object(queryset=queryset)
-        if post.author == self.request.user:
-            return post
-        return get_object_or_404(
-            Post.published_manager, id=self.kwargs[self.pk_url_kwarg]
-        )
+        post = super().get_object(queryset)
+        post.view_count += view_counter.hit(post.pk)
+        return post
 
     def get_context_data(self, **kwargs):
         comment_form = CommentForm()
@@ -136,7 +200,8 @@ class PostDetailView(DetailView):
         }
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, RateLimitMixin, CreateView):
+    ratelimit_group = 'post'
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
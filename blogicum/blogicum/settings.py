@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -24,9 +25,14 @@ INSTALLED_APPS = [
     'django_bootstrap5',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'perf.apps.PerfConfig',
 ]
 
 MIDDLEWARE = [
+    'perf.middleware.QueryTimingMiddleware',
+    'perf.nplusone.NPlusOneMiddleware',
+    'perf.slow_queries.SlowQueryMiddleware',
+    'perf.replicas.StickyPrimaryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -40,6 +46,8 @@ ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+TEMPLATES_COMPILED_DIR = BASE_DIR / 'templates_compiled'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -66,6 +74,19 @@ DATABASES = {
     }
 }
 
+# A read replica for the feed views; to try it locally point
+# REPLICA_DB_NAME at a copy of db.sqlite3.
+if os.environ.get('REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['REPLICA_DB_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['perf.replicas.ReplicaRouter']
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,3 +140,87 @@ LOGIN_URL = 'login'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+QUERY_TIMING = False
+
+NPLUSONE_DETECTION = False
+
+NPLUSONE_RAISE = False
+
+NPLUSONE_THRESHOLD = 5
+
+SLOW_QUERY_LOG = False
+
+SLOW_QUERY_THRESHOLD_MS = 100
+
+SLOW_QUERY_MAX_FINGERPRINTS = 500
+
+SLOW_QUERY_WINDOW = 200
+
+SLOW_QUERY_SNAPSHOT = BASE_DIR / 'slow_queries.json'
+
+SLOW_QUERY_SNAPSHOT_INTERVAL = 60
+
+TEMPLATE_PROFILING = False
+
+FAST_REVERSE_CACHE_SIZE = 4096
+
+REPLICA_STICKY_SECONDS = 10
+
+# Async feed views (blog/async_views.py); asgi.py turns them on.
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# Pragma profile from perf.sqlite.PRAGMA_PROFILES (or a dict of pragmas)
+# applied to every new SQLite connection.
+SQLITE_PRAGMAS = None
+
+# blog.scheduler: where `publish_scheduled` keeps its watermark, and how
+# often it looks for newly scheduled posts.
+PUBLICATION_WATERMARK = BASE_DIR / 'publication_watermark'
+
+PUBLICATION_POLL_SECONDS = 30
+
+# perf.ratelimit: token buckets per view group and key kind, and where
+# they are kept ('perf.ratelimit.CacheBackend' to share them between
+# processes through CACHES).
+RATELIMITS = {
+    'comment': {'user': '10/m', 'post': '60/m'},
+    'post': {'user': '5/m'},
+    'signup': {'ip': '5/h'},
+}
+
+RATELIMIT_BACKEND = 'perf.ratelimit.LocalBackend'
+
+# Number of reverse proxies in front of the site that append the client
+# address to X-Forwarded-For; 0 uses REMOTE_ADDR.
+RATELIMIT_TRUSTED_PROXIES = 0
+
+# blog.comment_batcher: save new comments in groups, one transaction per
+# COMMENT_BATCH_WINDOW_MS milliseconds or COMMENT_BATCH_MAX comments.
+COMMENT_GROUP_COMMIT = False
+
+COMMENT_BATCH_WINDOW_MS = 5
+
+COMMENT_BATCH_MAX = 500
+
+# blog.view_counts: post views are kept in memory and written every
+# VIEW_COUNT_FLUSH_SECONDS seconds or once VIEW_COUNT_MAX_PENDING are waiting.
+VIEW_COUNT_FLUSH_SECONDS = 10
+
+VIEW_COUNT_MAX_PENDING = 1000
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'perf': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
@@ -0,0 +1,32 @@
+from .settings import *  # noqa: F401,F403
+from .settings import (
+    DATABASES, TEMPLATES, TEMPLATES_COMPILED_DIR, TEMPLATES_DIR
+)
+
+DEBUG = False
+
+SQLITE_PRAGMAS = 'production'
+
+# Per worker process: at most MAX_SIZE open connections, recycled after
+# MAX_AGE seconds; a request waits up to TIMEOUT seconds for a free one.
+DATABASES = {
+    **DATABASES,
+    'default': {
+        **DATABASES['default'],
+        'ENGINE': 'perf.backends.pooled_sqlite3',
+        'POOL': {
+            'MAX_SIZE': 8,
+            'MAX_AGE': 300,
+            'TIMEOUT': 10,
+            'HEALTH_CHECK': True,
+        },
+    },
+}
+
+# With DEBUG off Django wraps the default loaders in the cached loader.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'DIRS': [TEMPLATES_COMPILED_DIR, TEMPLATES_DIR],
+    },
+]
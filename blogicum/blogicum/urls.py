@@ -5,17 +5,20 @@ from django.conf.urls.static import static
 from django.views.generic.edit import CreateView
 from django.urls import include, path, reverse_lazy
 
+from perf.ratelimit import ratelimit
+
 urlpatterns = [
+    path('admin/perf/', include('perf.urls', namespace='perf')),
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls', namespace='pages')),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
-        CreateView.as_view(
+        ratelimit('signup')(CreateView.as_view(
             template_name='registration/registration_form.html',
             form_class=UserCreationForm,
             success_url=reverse_lazy('blog:index'),
-        ),
+        )),
         name='registration',
     ),
     path('', include('blog.urls', namespace='blog')),
@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+class PerfConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'perf'
+    verbose_name = 'Производительность'
+
+    def ready(self):
+        from .sqlite import configure_connection
+        connection_created.connect(
+            configure_connection, dispatch_uid='perf.sqlite_pragmas'
+        )
+        if getattr(settings, 'TEMPLATE_PROFILING', False):
+            from .template_profiler import profiler
+            profiler.install()
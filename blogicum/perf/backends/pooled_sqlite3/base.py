@@ -0,0 +1,40 @@
+from django.db.backends.sqlite3 import base
+
+from perf.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite backend that takes connections from a per-process pool.
+
+    `close()` (called by Django at the end of every request when
+    `CONN_MAX_AGE` is 0) returns the connection to the pool, so the next
+    request skips opening the file, registering Django's SQL functions and
+    applying `SQLITE_PRAGMAS`. Only `foreign_keys`, which Django itself
+    turns off and on (e.g. in schema changes), is set again on checkout
+    so that it is never handed on switched off. In-memory databases are
+    never pooled. Configured with the `POOL` key of the database settings.
+    """
+
+    pool = None
+    reused_connection = False
+
+    def get_new_connection(self, conn_params):
+        if self.is_in_memory_db():
+            return super().get_new_connection(conn_params)
+        self.pool = get_pool(self.alias, self.settings_dict.get('POOL', {}))
+        connection, self.reused_connection = self.pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            )
+        )
+        if self.reused_connection:
+            # What Django's `get_new_connection()` sets on a new one.
+            connection.execute('PRAGMA foreign_keys = ON')
+        return connection
+
+    def _close(self):
+        if self.connection is not None and self.pool is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
+        else:
+            super()._close()
@@ -0,0 +1,82 @@
+"""Query hooks and middleware that also work under ASGI.
+
+`connection.execute_wrapper()` only sees the connection of the calling
+thread, but async views run their queries in worker threads (see
+`blog.async_views.db`). `wrap_queries()` keeps the active wrappers in a
+context variable instead: `sync_to_async` copies the context into the
+worker thread, and every connection runs the wrappers of the context
+that issues the query.
+"""
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_active = ContextVar('perf_query_wrappers', default=())
+
+
+def _run_active(execute, sql, params, many, context):
+    for wrapper in reversed(_active.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def _install(connection, **kwargs):
+    if _run_active not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_run_active)
+
+
+connection_created.connect(_install)
+
+
+@contextmanager
+def wrap_queries(*wrappers):
+    """Run the queries of this context, in any thread, through
+    `wrappers`, with the `execute_wrapper()` signature."""
+    for connection in connections.all():
+        _install(connection)
+    token = _active.set(_active.get() + wrappers)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+class HybridMiddleware:
+    """Base for middleware that runs natively in sync and async chains.
+
+    Subclasses may override `around(request)`, a context manager wrapped
+    around the rest of the chain, and `process_response()`, which gets
+    the value `around()` yielded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Tells Django to await `__call__`, as `MiddlewareMixin` does.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with self.around(request) as state:
+            response = self.get_response(request)
+        return self.process_response(request, response, state)
+
+    async def __acall__(self, request):
+        with self.around(request) as state:
+            response = await self.get_response(request)
+        return self.process_response(request, response, state)
+
+    @contextmanager
+    def around(self, request):
+        yield None
+
+    def process_response(self, request, response, state):
+        return response
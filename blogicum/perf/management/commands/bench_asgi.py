@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.slow_queries import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнить пропускную способность страниц ленты под WSGI (синхронные'
+        ' представления, пул потоков) и под ASGI (асинхронные'
+        ' представления) при заданной конкурентности. Каждый режим'
+        ' запускается в отдельном процессе на текущей базе данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths')
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument(
+            '--child', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS
+        )
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/']
+        if options['child']:
+            self.run_child(options['child'], paths, options)
+            return
+        for mode in ('wsgi', 'asgi'):
+            result = self.spawn(mode, paths, options)
+            self.stdout.write(
+                f'{mode}: {result["rps"]:>8.1f} запросов/с,'
+                f' p50={result["p50_ms"]} мс, p95={result["p95_ms"]} мс,'
+                f' ошибок {result["errors"]}'
+            )
+
+    def spawn(self, mode, paths, options):
+        env = {
+            **os.environ,
+            'BLOGICUM_ASYNC_VIEWS': '1' if mode == 'asgi' else '0',
+        }
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'),
+            'bench_asgi', '--child', mode,
+            '--requests', str(options['requests']),
+            '--concurrency', str(options['concurrency']),
+        ]
+        for path in paths:
+            command += ['--path', path]
+        process = subprocess.run(
+            command, env=env, capture_output=True, text=True
+        )
+        if process.returncode:
+            raise CommandError(process.stderr)
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def run_child(self, mode, paths, options):
+        targets = [
+            paths[number % len(paths)]
+            for number in range(options['requests'])
+        ]
+        run = self.run_wsgi if mode == 'wsgi' else self.run_asgi
+        started = time.perf_counter()
+        timings, errors = run(targets, options['concurrency'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(json.dumps({
+            'rps': len(targets) / elapsed,
+            'p50_ms': round(percentile(timings, 50) * 1000, 1),
+            'p95_ms': round(percentile(timings, 95) * 1000, 1),
+            'errors': errors,
+        }))
+
+    def run_wsgi(self, targets, concurrency):
+        from django.core.handlers.wsgi import WSGIHandler
+
+        application = WSGIHandler()
+
+        def call(target):
+            path, _, query = target.partition('?')
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': query,
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'wsgi.url_scheme': 'http',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+            }
+            statuses = []
+            start = time.perf_counter()
+            response = application(
+                environ, lambda status, headers: statuses.append(status)
+            )
+            b''.join(response)
+            response.close()
+            return time.perf_counter() - start, statuses[0].startswith('200')
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(call, targets))
+        return [t for t, _ in results], sum(not ok for _, ok in results)
+
+    def run_asgi(self, targets, concurrency):
+        from django.core.handlers.asgi import ASGIHandler
+
+        application = ASGIHandler()
+
+        async def call(target, semaphore):
+            path, _, query = target.partition('?')
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'query_string': query.encode(),
+                'headers': [(b'host', b'localhost')],
+                'server': ('localhost', 80),
+            }
+            statuses = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+
+            async with semaphore:
+                start = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - start, statuses[0] == 200
+
+        async def main():
+            semaphore = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(
+                *(call(target, semaphore) for target in targets)
+            )
+
+        results = asyncio.run(main())
+        return [t for t, _ in results], sum(not ok for _, ok in results)
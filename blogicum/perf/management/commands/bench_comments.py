@@ -0,0 +1,88 @@
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from blog.comment_batcher import CommentBatcher
+from blog.models import Category, Comment, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнить скорость записи комментариев к одному посту из многих'
+        ' потоков: отдельная транзакция на каждый комментарий и групповая'
+        ' фиксация (blog.comment_batcher). Пишет в текущую базу данных;'
+        ' временные пользователь, категория, пост и комментарии удаляются'
+        ' после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--comments', type=int, default=2000)
+        parser.add_argument('--window-ms', type=float, default=5)
+
+    def handle(self, *args, **options):
+        name = f'bench-{uuid.uuid4().hex[:8]}'
+        user = User.objects.create(username=name)
+        category = Category.objects.create(
+            title=name, description=name, slug=name
+        )
+        post = Post.objects.create(
+            title=name, text=name, pub_date=timezone.now(),
+            author=user, category=category,
+        )
+        try:
+            for mode in ('save', 'group'):
+                rate, errors, batches = self.run(mode, post, options)
+                label = (
+                    'транзакция на комментарий' if mode == 'save'
+                    else 'групповая фиксация'
+                )
+                self.stdout.write(
+                    f'{label:>26}: {rate:>8.0f} комментариев/с,'
+                    f' ошибок {errors}'
+                    + (f', пакетов {batches}' if mode == 'group' else '')
+                )
+        finally:
+            post.delete()
+            category.delete()
+            user.delete()
+
+    def run(self, mode, post, options):
+        batcher = CommentBatcher(window_ms=options['window_ms'])
+        per_thread = options['comments'] // options['threads']
+        errors = []
+
+        def worker():
+            try:
+                for number in range(per_thread):
+                    comment = Comment(
+                        post_id=post.pk, author_id=post.author_id,
+                        text=f'комментарий {number}',
+                    )
+                    try:
+                        if mode == 'save':
+                            comment.save()
+                        else:
+                            batcher.submit(comment)
+                    except DatabaseError:
+                        errors.append(1)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker)
+            for _ in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        batcher.stop()
+        written = per_thread * options['threads'] - len(errors)
+        return written / elapsed, len(errors), batcher.batches
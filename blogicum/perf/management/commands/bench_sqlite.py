@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from perf.sqlite import PRAGMA_PROFILES, apply_pragmas
+
+SCHEMA = (
+    'CREATE TABLE comment ('
+    ' id INTEGER PRIMARY KEY, post_id INTEGER NOT NULL,'
+    ' text TEXT NOT NULL, created_at REAL NOT NULL)'
+)
+INSERT = 'INSERT INTO comment (post_id, text, created_at) VALUES (?, ?, ?)'
+SELECT = (
+    'SELECT id, text, created_at FROM comment'
+    ' WHERE post_id = ? ORDER BY id DESC LIMIT 10'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнить пропускную способность конкурентных чтений и записей'
+        ' в SQLite без профиля прагм и с профилем.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', choices=PRAGMA_PROFILES, default='production'
+        )
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=3.0)
+
+    def connect(self, path, pragmas):
+        # Autocommit, like Django's SQLite backend.
+        connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        apply_pragmas(connection.cursor(), pragmas)
+        return connection
+
+    def worker(self, path, pragmas, write, deadline, totals, lock):
+        connection = self.connect(path, pragmas)
+        done = errors = 0
+        number = 0
+        while time.monotonic() < deadline:
+            number += 1
+            try:
+                if write:
+                    connection.execute(
+                        INSERT, (number % 50, 'комментарий', time.time())
+                    )
+                else:
+                    connection.execute(SELECT, (number % 50,)).fetchall()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        connection.close()
+        with lock:
+            key = 'writes' if write else 'reads'
+            totals[key] += done
+            totals['errors'] += errors
+
+    def run(self, pragmas, options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.sqlite3')
+            setup = self.connect(path, pragmas)
+            setup.execute(SCHEMA)
+            setup.execute('CREATE INDEX comment_post ON comment (post_id)')
+            setup.execute('BEGIN')
+            setup.executemany(INSERT, [
+                (number % 50, 'комментарий', time.time())
+                for number in range(5000)
+            ])
+            setup.execute('COMMIT')
+            setup.close()
+            totals = {'reads': 0, 'writes': 0, 'errors': 0}
+            lock = threading.Lock()
+            deadline = time.monotonic() + options['duration']
+            threads = [
+                threading.Thread(target=self.worker, args=(
+                    path, pragmas, write, deadline, totals, lock,
+                ))
+                for write in (
+                    [False] * options['readers'] + [True] * options['writers']
+                )
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return totals
+
+    def handle(self, *args, **options):
+        for label, pragmas in (
+            ('без профиля', {}),
+            (options['profile'], PRAGMA_PROFILES[options['profile']]),
+        ):
+            totals = self.run(pragmas, options)
+            seconds = options['duration']
+            self.stdout.write(
+                f'{label:>12}: чтений {totals["reads"] / seconds:>9.0f}/с,'
+                f' записей {totals["writes"] / seconds:>7.0f}/с,'
+                f' ошибок блокировки {totals["errors"]}'
+            )
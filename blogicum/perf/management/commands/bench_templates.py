@@ -0,0 +1,73 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import Context, Engine, engines
+from django.utils import timezone
+
+from blog.models import Category, Location, Post, User
+from perf.template_inliner import TemplateInliner
+
+CARDS_TEMPLATE = (
+    '{% for post in posts %}'
+    '{% include "includes/post_card.html" %}'
+    '{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = 'Сравнить стоимость рендеринга одной карточки поста.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=10)
+        parser.add_argument('--rounds', type=int, default=200)
+
+    def make_posts(self, count):
+        author = User(username='author')
+        category = Category(title='Категория', slug='category',
+                            is_published=True)
+        location = Location(name='Место', is_published=True)
+        return [
+            Post(id=number, title=f'Пост {number}', text='Текст ' * 50,
+                 pub_date=timezone.now(), author=author, category=category,
+                 location=location, is_published=True)
+            for number in range(1, count + 1)
+        ]
+
+    def make_engine(self, cached):
+        loaders = ['django.template.loaders.filesystem.Loader']
+        if cached:
+            loaders = [('django.template.loaders.cached.Loader', loaders)]
+        return Engine(
+            dirs=[settings.TEMPLATES_DIR],
+            loaders=loaders,
+            libraries=engines['django'].engine.libraries,
+        )
+
+    def measure(self, engine, source, posts, rounds):
+        template = engine.from_string(source)
+        context = Context({'posts': posts})
+        template.render(context)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            template.render(context)
+        return (time.perf_counter() - start) / rounds / len(posts)
+
+    def handle(self, *args, **options):
+        posts = self.make_posts(options['cards'])
+        inlined = TemplateInliner([settings.TEMPLATES_DIR]).inline(
+            CARDS_TEMPLATE
+        )
+        variants = (
+            ('default loaders', self.make_engine(False), CARDS_TEMPLATE),
+            ('cached loader', self.make_engine(True), CARDS_TEMPLATE),
+            ('cached + inlined', self.make_engine(True), inlined),
+        )
+        baseline = None
+        for label, engine, source in variants:
+            per_card = self.measure(engine, source, posts, options['rounds'])
+            baseline = baseline or per_card
+            self.stdout.write(
+                f'{label:<18} {per_card * 1_000_000:8.1f} µs/card'
+                f'  x{baseline / per_card:.2f}'
+            )
@@ -0,0 +1,30 @@
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from perf.template_inliner import TemplateInliner
+
+
+class Command(BaseCommand):
+    help = (
+        'Собрать в TEMPLATES_COMPILED_DIR шаблоны, в которые встроены'
+        ' статические {% include %}.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=settings.TEMPLATES_COMPILED_DIR
+        )
+
+    def handle(self, *args, **options):
+        shutil.rmtree(options['output'], ignore_errors=True)
+        inliner = TemplateInliner([settings.TEMPLATES_DIR])
+        compiled = inliner.compile_dir(
+            settings.TEMPLATES_DIR, options['output']
+        )
+        for name in compiled:
+            self.stdout.write(f'  {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Собрано шаблонов: {len(compiled)} в {options["output"]}'
+        ))
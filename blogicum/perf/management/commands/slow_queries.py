@@ -0,0 +1,43 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.views import SLOW_QUERY_ORDERINGS
+
+
+class Command(BaseCommand):
+    help = 'Показать самые медленные запросы из снимка SLOW_QUERY_SNAPSHOT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--order-by', choices=SLOW_QUERY_ORDERINGS, default='total_ms'
+        )
+        parser.add_argument(
+            '--snapshot',
+            default=getattr(settings, 'SLOW_QUERY_SNAPSHOT', None),
+        )
+
+    def handle(self, *args, **options):
+        if not options['snapshot']:
+            raise CommandError('Не задан путь к снимку SLOW_QUERY_SNAPSHOT.')
+        try:
+            with open(options['snapshot'], encoding='utf-8') as snapshot:
+                rows = json.load(snapshot)
+        except FileNotFoundError:
+            raise CommandError(
+                f'Снимок {options["snapshot"]} не найден: включите'
+                ' SLOW_QUERY_LOG и дождитесь записи снимка.'
+            )
+        rows.sort(key=lambda row: row[options['order_by']], reverse=True)
+        for row in rows[:options['limit']]:
+            self.stdout.write(
+                f'{row["total_ms"]:>10.1f} ms total  {row["count"]:>7}x  '
+                f'p50={row["p50_ms"]} p95={row["p95_ms"]} '
+                f'p99={row["p99_ms"]} max={row["max_ms"]}'
+            )
+            self.stdout.write(f'  {row["fingerprint"]}')
+            if row['plan']:
+                for line in row['plan'].splitlines():
+                    self.stdout.write(f'    {line}')
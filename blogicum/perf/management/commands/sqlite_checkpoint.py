@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+
+class Command(BaseCommand):
+    help = (
+        'Перенести WAL-журнал SQLite в файл базы (PRAGMA wal_checkpoint),'
+        ' чтобы журнал не рос между автоматическими контрольными точками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=CHECKPOINT_MODES, default='TRUNCATE'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Контрольные точки WAL есть только в SQLite.')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+            if journal_mode.lower() != 'wal':
+                raise CommandError(
+                    f'База в режиме журнала {journal_mode}, а не WAL.'
+                )
+            cursor.execute(f'PRAGMA wal_checkpoint({options["mode"]})')
+            busy, log_frames, checkpointed = cursor.fetchone()
+        if busy:
+            self.stderr.write(
+                'Контрольная точка не завершена: базу держат другие'
+                ' соединения.'
+            )
+        self.stdout.write(
+            f'{options["mode"]}: кадров в журнале {log_frames},'
+            f' перенесено {checkpointed}.'
+        )
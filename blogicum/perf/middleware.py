@@ -0,0 +1,118 @@
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.backends.django import Template
+
+from .instrumentation import HybridMiddleware, wrap_queries
+
+logger = logging.getLogger('perf.requests')
+
+current_timing = ContextVar('current_timing', default=None)
+
+
+class RequestTiming:
+    """Query and template timings collected for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_db_time = 0.0
+        self.template_depth = 0
+        # Async views run queries in several threads at once.
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.queries += 1
+                self.db_time += duration
+                if self.template_depth:
+                    self.template_db_time += duration
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            'tpl;dur={:.2f}'.format(
+                (self.template_time - self.template_db_time) * 1000
+            ),
+            f'total;dur={self.total_time * 1000:.2f}',
+        ))
+
+
+def _timed_render(render):
+    @functools.wraps(render)
+    def wrapper(self, context=None, request=None):
+        timing = current_timing.get()
+        if timing is None:
+            return render(self, context, request)
+        timing.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            timing.template_depth -= 1
+            if not timing.template_depth:
+                timing.template_time += time.perf_counter() - start
+    wrapper.timed = True
+    return wrapper
+
+
+def install_template_timing():
+    if not getattr(Template.render, 'timed', False):
+        Template.render = _timed_render(Template.render)
+
+
+class QueryTimingMiddleware(HybridMiddleware):
+    """Report DB and template time in `Server-Timing` and the request log.
+
+    Enabled by `settings.QUERY_TIMING`; when it is off the middleware
+    removes itself from the chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_TIMING', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        install_template_timing()
+
+    @contextmanager
+    def around(self, request):
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            with wrap_queries(timing):
+                yield timing
+        finally:
+            current_timing.reset(token)
+
+    def process_response(self, request, response, timing):
+        response['Server-Timing'] = timing.server_timing()
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timing.queries,
+            'db_ms': round(timing.db_time * 1000, 2),
+            'tpl_ms': round(
+                (timing.template_time - timing.template_db_time) * 1000, 2
+            ),
+            'total_ms': round(timing.total_time * 1000, 2),
+        }))
+        return response
@@ -0,0 +1,123 @@
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Node
+
+from .instrumentation import HybridMiddleware, wrap_queries
+from .sql import fingerprint, is_select
+
+logger = logging.getLogger('perf.nplusone')
+
+_RENDER_ANNOTATED = getattr(
+    Node.render_annotated, '__wrapped__', Node.render_annotated
+).__code__
+_PERF_DIR = os.path.dirname(__file__)
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def _template_location(frame):
+    while frame is not None:
+        if frame.f_code is _RENDER_ANNOTATED:
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                name = origin.template_name or origin.name
+                return f'{name}:{token.lineno}'
+        frame = frame.f_back
+    return None
+
+
+def _code_location(frame):
+    app_root = str(getattr(settings, 'NPLUSONE_APP_ROOT', settings.BASE_DIR))
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(app_root)
+                and not filename.startswith(_PERF_DIR)):
+            return f'{os.path.relpath(filename, app_root)}:{frame.f_lineno}'
+        frame = frame.f_back
+    return None
+
+
+def locate(frame):
+    """Name the template line or the project code that issued a query."""
+    return _template_location(frame) or _code_location(frame) or 'unknown'
+
+
+class NPlusOneDetector:
+    """Count repeated SELECT shapes issued while the detector is active."""
+
+    def __init__(self, threshold=None):
+        if threshold is None:
+            threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+        self.threshold = threshold
+        self.seen = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        if is_select(sql):
+            key = fingerprint(sql)
+            with self._lock:
+                entry = self.seen.setdefault(key, [0, None])
+                entry[0] += 1
+                repeated = entry[0] > 1 and entry[1] is None
+            if repeated:
+                entry[1] = locate(sys._getframe(1))
+        return execute(sql, params, many, context)
+
+    @property
+    def offenders(self):
+        return [
+            (location, count, key)
+            for key, (count, location) in self.seen.items()
+            if count >= self.threshold
+        ]
+
+    def report(self, raise_errors=False, label=''):
+        offenders = self.offenders
+        if not offenders:
+            return
+        message = '\n'.join(
+            f'{count} similar queries from {location}: {key}'
+            for location, count, key in offenders
+        )
+        if label:
+            message = f'{label}\n{message}'
+        if raise_errors:
+            raise NPlusOneError(message)
+        logger.warning('Possible N+1 queries: %s', message)
+
+
+@contextmanager
+def detect_nplusone(threshold=None, raise_errors=True, label=''):
+    detector = NPlusOneDetector(threshold)
+    with wrap_queries(detector):
+        yield detector
+    detector.report(raise_errors, label)
+
+
+class NPlusOneMiddleware(HybridMiddleware):
+    """Log (or raise on) repeated query shapes within a request.
+
+    Enabled by `settings.NPLUSONE_DETECTION`; `settings.NPLUSONE_RAISE`
+    turns the warning into `NPlusOneError`.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'NPLUSONE_DETECTION', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def around(self, request):
+        return detect_nplusone(
+            raise_errors=getattr(settings, 'NPLUSONE_RAISE', False),
+            label=f'{request.method} {request.path}',
+        )
@@ -0,0 +1,189 @@
+import atexit
+import sqlite3
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """Process-wide pool of open DB-API connections.
+
+    At most `max_size` connections exist at once; `acquire()` waits up to
+    `timeout` seconds for one to be released. Idle connections older than
+    `max_age` seconds or failing `SELECT 1` are closed instead of reused;
+    the check runs after the connection is taken, outside the lock.
+    """
+
+    def __init__(self, max_size=8, max_age=300, timeout=10,
+                 health_check=True):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.timeout = timeout
+        self.health_check = health_check
+        self._idle = deque()
+        self._born = {}
+        self._size = 0
+        self._condition = threading.Condition()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.checkouts = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+
+    def _expired(self, connection):
+        return time.monotonic() - self._born[id(connection)] > self.max_age
+
+    def _healthy(self, connection):
+        if not self.health_check:
+            return True
+        try:
+            connection.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, connection):
+        self._born.pop(id(connection), None)
+        self._size -= 1
+        self._condition.notify()
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+
+    def _take(self, deadline):
+        """An idle connection, None to open a new one, or wait.
+
+        Called with the lock held; the health check is left to the caller
+        so that other threads are not kept waiting behind `SELECT 1`.
+        """
+        while True:
+            while self._idle:
+                connection = self._idle.pop()
+                if not self._expired(connection):
+                    return connection
+                self.recycled += 1
+                self._discard(connection)
+            if self._size < self.max_size:
+                self._size += 1
+                self.misses += 1
+                return None
+            remaining = deadline - time.monotonic()
+            self.waits += 1
+            if remaining <= 0 or not self._condition.wait(remaining):
+                self.timeouts += 1
+                raise PoolTimeout(
+                    f'No database connection released within'
+                    f' {self.timeout} s (pool size {self.max_size}).'
+                )
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                connection = self._take(deadline)
+            if connection is None:
+                return None
+            healthy = self._healthy(connection)
+            with self._condition:
+                if healthy:
+                    self.hits += 1
+                    return connection
+                self.discarded += 1
+                self._discard(connection)
+
+    def acquire(self, connect):
+        """Return `(connection, reused)`; `connect()` opens new ones."""
+        started = time.perf_counter()
+        connection = self._checkout()
+        reused = connection is not None
+        if not reused:
+            try:
+                connection = connect()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._born[id(connection)] = time.monotonic()
+        elapsed = time.perf_counter() - started
+        with self._condition:
+            self.checkouts += 1
+            self.checkout_time += elapsed
+            self.max_checkout_time = max(self.max_checkout_time, elapsed)
+        return connection, reused
+
+    def release(self, connection):
+        with self._condition:
+            if connection.in_transaction:
+                try:
+                    connection.rollback()
+                except sqlite3.Error:
+                    self.discarded += 1
+                    self._discard(connection)
+                    return
+            if self._expired(connection):
+                self.recycled += 1
+                self._discard(connection)
+                return
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def close_idle(self):
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop())
+
+    def stats(self):
+        with self._condition:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'recycled': self.recycled,
+                'discarded': self.discarded,
+                'avg_checkout_ms': round(
+                    self.checkout_time / self.checkouts * 1000, 3
+                ) if self.checkouts else 0,
+                'max_checkout_ms': round(self.max_checkout_time * 1000, 3),
+            }
+
+
+pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options):
+    """The pool of database `alias`, created from its `POOL` options."""
+    with _pools_lock:
+        pool = pools.get(alias)
+        if pool is None:
+            pool = pools[alias] = ConnectionPool(
+                max_size=options.get('MAX_SIZE', 8),
+                max_age=options.get('MAX_AGE', 300),
+                timeout=options.get('TIMEOUT', 10),
+                health_check=options.get('HEALTH_CHECK', True),
+            )
+        return pool
+
+
+@atexit.register
+def close_pools():
+    for pool in list(pools.values()):
+        pool.close_idle()
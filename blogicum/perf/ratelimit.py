@@ -0,0 +1,235 @@
+"""Token-bucket limits for write views.
+
+A rate such as `'10/m'` is a bucket of 10 tokens refilled at 10 per
+minute: bursts of up to 10 requests pass, then one per 6 seconds. Each
+view group in `settings.RATELIMITS` has buckets per key kind (`user`,
+`post`, `ip`); a request takes a token from each of its buckets and is
+refused with 429 as soon as one is empty.
+
+`user` and `post` buckets are only charged for a logged-in client, so
+anonymous requests cannot drain the bucket of a post for everybody; put
+the check below `login_required`. The `ip` key is the client address
+seen by the first of `RATELIMIT_TRUSTED_PROXIES` reverse proxies.
+Buckets live in process memory (`LocalBackend`) or in a Django cache
+shared by all processes (`CacheBackend`), see `RATELIMIT_BACKEND`.
+"""
+import functools
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def client_ip(request):
+    """Address of the client; with `RATELIMIT_TRUSTED_PROXIES` proxies in
+    front, the one the outermost of them appended to X-Forwarded-For."""
+    proxies = getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 0)
+    if proxies:
+        forwarded = [
+            address.strip() for address in
+            request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+            if address.strip()
+        ]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR')
+
+
+def _user_id(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def _post_key(request, kwargs):
+    if _user_id(request) is None:
+        return None
+    return kwargs.get('post_id')
+
+
+KEYS = {
+    'user': lambda request, kwargs: _user_id(request),
+    'post': _post_key,
+    'ip': lambda request, kwargs: client_ip(request),
+}
+
+
+def parse_rate(rate):
+    """`'10/m'` -> `(10, 60)`: capacity and refill period in seconds."""
+    count, _, period = rate.partition('/')
+    try:
+        capacity = int(count)
+        seconds = PERIODS[period]
+    except (KeyError, ValueError):
+        raise ImproperlyConfigured(
+            f'Invalid rate {rate!r}; expected e.g. "10/m".'
+        )
+    if capacity < 1:
+        raise ImproperlyConfigured(f'Invalid rate {rate!r}.')
+    return capacity, seconds
+
+
+def take_token(state, capacity, period, now):
+    """Take a token from the bucket `state`, `(tokens, updated_at)`.
+
+    Returns the new state and the seconds to wait for a token, 0 if one
+    was taken. A missing state is a full bucket.
+    """
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) * period / capacity
+
+
+class LocalBackend:
+    """Buckets of this process; the least recently used are dropped past
+    `max_keys`."""
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        now = time.monotonic()
+        with self._lock:
+            state, wait = take_token(
+                self._buckets.pop(key, None), capacity, period, now
+            )
+            self._buckets[key] = state
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class CacheBackend:
+    """Buckets in the Django cache `alias`, shared between processes.
+
+    Reading and writing a bucket is not atomic, so concurrent requests
+    may occasionally both take its last token.
+    """
+
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def take(self, key, capacity, period):
+        cache_key = f'ratelimit:{key}'
+        state, wait = take_token(
+            self.cache.get(cache_key), capacity, period, time.time()
+        )
+        # An untouched bucket is full again after `period`.
+        self.cache.set(cache_key, state, timeout=period)
+        return wait
+
+
+class RateLimiter:
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            backend = getattr(
+                settings, 'RATELIMIT_BACKEND', 'perf.ratelimit.LocalBackend'
+            )
+            self._backend = import_string(backend)()
+        return self._backend
+
+    def reset(self):
+        """Forget all buckets and counters."""
+        with self._lock:
+            self._backend = None
+            self.allowed = Counter()
+            self.rejected = Counter()
+
+    def check(self, group, request, kwargs):
+        """Seconds `request` must wait, 0 if it may go on."""
+        limits = getattr(settings, 'RATELIMITS', {}).get(group, {})
+        for kind, rate in limits.items():
+            value = KEYS[kind](request, kwargs)
+            if value is None:
+                continue
+            capacity, period = parse_rate(rate)
+            wait = self.backend.take(
+                f'{group}:{kind}:{value}', capacity, period
+            )
+            if wait:
+                with self._lock:
+                    self.rejected[group, kind] += 1
+                return wait
+        with self._lock:
+            self.allowed[group] += 1
+        return 0
+
+    def stats(self):
+        with self._lock:
+            groups = set(self.allowed) | {group for group, _ in self.rejected}
+            return {
+                group: {
+                    'allowed': self.allowed[group],
+                    'rejected': {
+                        kind: count
+                        for (name, kind), count in self.rejected.items()
+                        if name == group
+                    },
+                }
+                for group in sorted(groups)
+            }
+
+
+limiter = RateLimiter()
+
+
+def too_many_requests(wait):
+    response = HttpResponse(
+        'Слишком много запросов, попробуйте позже.',
+        status=429,
+        content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(math.ceil(wait))
+    return response
+
+
+def ratelimit(group, methods=('POST',)):
+    """Apply the `group` limits to `methods` requests of a view.
+
+    Put it below `login_required`: `user` and `post` keys need
+    `request.user`, and anonymous requests are not charged to them.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = limiter.check(group, request, kwargs)
+                if wait:
+                    return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RateLimitMixin:
+    """`ratelimit(ratelimit_group)` for POST requests of class-based
+    views; list it after `LoginRequiredMixin`."""
+
+    ratelimit_group = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'POST':
+            wait = limiter.check(self.ratelimit_group, request, kwargs)
+            if wait:
+                return too_many_requests(wait)
+        return super().dispatch(request, *args, **kwargs)
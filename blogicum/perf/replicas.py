@@ -0,0 +1,127 @@
+import asyncio
+import functools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import HybridMiddleware
+
+current_replica = ContextVar('current_replica', default=None)
+
+STICKY_COOKIE = 'primary_until'
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the current view, if any.
+
+    Writes, and every read outside a `read_from_replica` view, go to
+    `default`. Sessions are always read from `default` so that a lagging
+    replica cannot log a user out.
+    """
+
+    primary_apps = {'sessions'}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in self.primary_apps:
+            return None
+        return current_replica.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+def is_sticky(request):
+    """Whether the client wrote recently and must read its own writes."""
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+@contextmanager
+def use_replica(alias):
+    token = current_replica.set(alias)
+    try:
+        yield
+    finally:
+        current_replica.reset(token)
+
+
+def choose_replica(request):
+    replicas = getattr(settings, 'DATABASE_REPLICAS', ())
+    if (not replicas or request.method not in ('GET', 'HEAD')
+            or is_sticky(request)):
+        return None
+    return random.choice(replicas)
+
+
+def read_from_replica(view):
+    """Serve GET/HEAD requests of `view` from a read replica.
+
+    Lazy template responses are rendered inside the view so that the
+    queries made while rendering use the replica too.
+    """
+    if asyncio.iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            alias = choose_replica(request)
+            if alias is None:
+                return await view(request, *args, **kwargs)
+            with use_replica(alias):
+                return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        alias = choose_replica(request)
+        if alias is None:
+            return view(request, *args, **kwargs)
+        with use_replica(alias):
+            response = view(request, *args, **kwargs)
+            if (hasattr(response, 'render')
+                    and not getattr(response, 'is_rendered', True)):
+                response.render()
+        return response
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """`read_from_replica` for class-based views."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return read_from_replica(super().as_view(**initkwargs))
+
+
+class StickyPrimaryMiddleware(HybridMiddleware):
+    """Pin a client to the primary for a while after it writes.
+
+    Any unsafe request marks the client with a cookie for
+    `settings.REPLICA_STICKY_SECONDS`; `read_from_replica` views skip the
+    replica while it is set. Unused when no replicas are configured.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'DATABASE_REPLICAS', ()):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.window = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+
+    def process_response(self, request, response, state):
+        if (request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+                and response.status_code < 500):
+            response.set_cookie(
+                STICKY_COOKIE, str(time.time() + self.window),
+                max_age=self.window, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,187 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, transaction
+
+from .instrumentation import HybridMiddleware, wrap_queries
+from .sql import fingerprint, is_select
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class QueryStats:
+    def __init__(self, sql, window):
+        self.sql = sql
+        self.durations = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.plan = None
+        self.last_seen = None
+
+    def add(self, duration):
+        self.durations.append(duration)
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.last_seen = time.time()
+
+    def as_dict(self):
+        durations = list(self.durations)
+        return {
+            'fingerprint': self.sql,
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'p50_ms': round(percentile(durations, 50) * 1000, 3),
+            'p95_ms': round(percentile(durations, 95) * 1000, 3),
+            'p99_ms': round(percentile(durations, 99) * 1000, 3),
+            'plan': self.plan,
+            'last_seen': self.last_seen,
+        }
+
+
+class SlowQueryStore:
+    """Per-fingerprint query durations, bounded in fingerprints and samples.
+
+    The least recently seen fingerprint is evicted once `max_fingerprints`
+    is reached; percentiles are computed over the last `window` samples.
+    The store lives in process memory: under several workers each one
+    keeps, and snapshots, only the queries it ran itself.
+    """
+
+    def __init__(self, max_fingerprints=500, window=200):
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self._stats = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, sql, duration):
+        """Add a sample; return True if the fingerprint has no plan yet."""
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(key, self.window)
+                if len(self._stats) > self.max_fingerprints:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(key)
+            stats.add(duration)
+            return stats.plan is None
+
+    def set_plan(self, sql, plan):
+        with self._lock:
+            stats = self._stats.get(fingerprint(sql))
+            if stats is not None:
+                stats.plan = plan
+
+    def top(self, limit=20, order_by='total_ms'):
+        with self._lock:
+            rows = [stats.as_dict() for stats in self._stats.values()]
+        return sorted(rows, key=lambda row: row[order_by],
+                      reverse=True)[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as snapshot:
+            json.dump(self.top(limit=None), snapshot, ensure_ascii=False)
+
+
+store = SlowQueryStore(
+    max_fingerprints=getattr(settings, 'SLOW_QUERY_MAX_FINGERPRINTS', 500),
+    window=getattr(settings, 'SLOW_QUERY_WINDOW', 200),
+)
+
+
+def explain(connection, sql, params):
+    prefix = connection.ops.explain_query_prefix()
+    wrappers = connection.execute_wrappers
+    connection.execute_wrappers = []
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                return '\n'.join(
+                    ' '.join(str(column) for column in row)
+                    for row in cursor.fetchall()
+                )
+    except DatabaseError as error:
+        return f'EXPLAIN failed: {error}'
+    finally:
+        connection.execute_wrappers = wrappers
+
+
+class SlowQueryRecorder:
+    """Record the queries that take `threshold` seconds or more.
+
+    Faster queries only cost a timer: fingerprinting is a handful of
+    regular expressions and is not worth paying on every query.
+    """
+
+    def __init__(self, store, threshold):
+        self.store = store
+        self.threshold = threshold
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if duration < self.threshold:
+            return result
+        if self.store.record(sql, duration) and not many:
+            if is_select(sql):
+                self.store.set_plan(
+                    sql, explain(context['connection'], sql, params)
+                )
+        return result
+
+
+class SlowQueryMiddleware(HybridMiddleware):
+    """Record queries slower than `settings.SLOW_QUERY_THRESHOLD_MS`
+    into `store` and EXPLAIN them.
+
+    Enabled by `settings.SLOW_QUERY_LOG`. A JSON snapshot of the store is
+    written to `settings.SLOW_QUERY_SNAPSHOT` at most once per
+    `settings.SLOW_QUERY_SNAPSHOT_INTERVAL` seconds for the
+    `slow_queries` management command. Both the page and the snapshot
+    show one worker's store: with several workers the file holds the
+    store of whichever wrote last, not totals across workers.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SLOW_QUERY_LOG', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.recorder = SlowQueryRecorder(
+            store, getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+        )
+        self.snapshot_path = getattr(settings, 'SLOW_QUERY_SNAPSHOT', None)
+        self.snapshot_interval = getattr(
+            settings, 'SLOW_QUERY_SNAPSHOT_INTERVAL', 60
+        )
+        self.last_snapshot = time.monotonic()
+
+    def around(self, request):
+        return wrap_queries(self.recorder)
+
+    def process_response(self, request, response, state):
+        now = time.monotonic()
+        if (self.snapshot_path
+                and now - self.last_snapshot >= self.snapshot_interval):
+            self.last_snapshot = now
+            store.dump(self.snapshot_path)
+        return response
@@ -0,0 +1,18 @@
+import re
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?\b')
+_IN_LISTS = re.compile(r'\bIN \(\?(?:, \?)*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Reduce SQL to its shape: literals and placeholders become `?`."""
+    sql = _STRINGS.sub('?', sql.replace('%s', '?'))
+    sql = _NUMBERS.sub('?', sql)
+    sql = _IN_LISTS.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def is_select(sql):
+    return sql.lstrip()[:6].upper() == 'SELECT'
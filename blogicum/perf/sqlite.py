@@ -0,0 +1,70 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+PRAGMA_PROFILES = {
+    # Concurrent readers with one writer at a time: WAL keeps readers off
+    # the writer's lock, NORMAL sync is durable across crashes of the
+    # process (not of the OS) in WAL mode, busy_timeout makes a second
+    # writer wait instead of failing with "database is locked".
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -20000,
+        'temp_store': 'MEMORY',
+    },
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+}
+
+_NAME = re.compile(r'^[a-z_]+$')
+_VALUE = re.compile(r'^-?\w+$')
+
+
+def get_pragmas(profile=None):
+    """Pragmas of `settings.SQLITE_PRAGMAS`: a profile name or a dict."""
+    if profile is None:
+        profile = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if not profile:
+        return {}
+    if isinstance(profile, str):
+        try:
+            profile = PRAGMA_PROFILES[profile]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f'Unknown SQLite pragma profile {profile!r}; choose one of'
+                f' {", ".join(PRAGMA_PROFILES)}.'
+            )
+    for name, value in profile.items():
+        if not _NAME.match(name) or not _VALUE.match(str(value)):
+            raise ImproperlyConfigured(
+                f'Invalid SQLite pragma {name}={value!r}.'
+            )
+    return profile
+
+
+def apply_pragmas(cursor, pragmas):
+    # journal_mode goes first: it cannot change inside a transaction and
+    # it decides what synchronous levels mean.
+    for name in sorted(pragmas, key=lambda name: name != 'journal_mode'):
+        cursor.execute(f'PRAGMA {name} = {pragmas[name]}')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """`connection_created` receiver applying the configured pragmas."""
+    if connection.vendor != 'sqlite':
+        return
+    if getattr(connection, 'reused_connection', False):
+        # Pooled connections keep the profile applied when they opened;
+        # the backend resets the pragmas a request may have changed.
+        return
+    pragmas = get_pragmas()
+    if pragmas:
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, pragmas)
@@ -0,0 +1,64 @@
+import re
+from pathlib import Path
+
+STATIC_INCLUDE = re.compile(
+    r'{%\s*include\s+(?P<quote>["\'])(?P<name>[^"\']+)(?P=quote)\s*%}'
+)
+NOT_INLINABLE = re.compile(
+    r'{%\s*(?:extends|block|include\s+\w|(?:resetcycle|cycle|ifchanged)\b)'
+    r'|{%\s*(?!with\b)\w+[^%]*\sas\s+\w+\s*%}'
+)
+
+
+class TemplateInliner:
+    """Replace static `{% include "name" %}` tags with the included source.
+
+    Only includes without `with`/`only` are inlined, and only when the
+    included template neither extends, defines blocks, includes by
+    variable nor assigns context variables (`... as name`), so that the
+    output renders exactly as the original. Templates with `{% cycle %}`,
+    `{% resetcycle %}` or `{% ifchanged %}` are kept too: `include` gives
+    each rendering fresh state for them, inlined copies would share it.
+    """
+
+    def __init__(self, template_dirs):
+        self.template_dirs = [Path(directory) for directory in template_dirs]
+        self._sources = {}
+
+    def source(self, name):
+        if name not in self._sources:
+            for directory in self.template_dirs:
+                path = directory / name
+                if path.is_file():
+                    self._sources[name] = path.read_text(encoding='utf-8')
+                    break
+            else:
+                self._sources[name] = None
+        return self._sources[name]
+
+    def inline(self, source, parents=()):
+        def replace(match):
+            name = match.group('name')
+            included = self.source(name)
+            if (included is None or name in parents
+                    or NOT_INLINABLE.search(included)):
+                return match.group(0)
+            return self.inline(included, parents + (name,))
+
+        return STATIC_INCLUDE.sub(replace, source)
+
+    def compile_dir(self, source_dir, output_dir):
+        """Write inlined copies of changed templates; return their names."""
+        source_dir, output_dir = Path(source_dir), Path(output_dir)
+        compiled = []
+        for path in sorted(source_dir.rglob('*.html')):
+            name = path.relative_to(source_dir).as_posix()
+            source = path.read_text(encoding='utf-8')
+            inlined = self.inline(source, (name,))
+            if inlined == source:
+                continue
+            target = output_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(inlined, encoding='utf-8')
+            compiled.append(name)
+        return compiled
@@ -0,0 +1,128 @@
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.template.base import Node, Template
+from django.template.defaulttags import URLNode
+from django.template.loader_tags import IncludeNode
+
+_stack = ContextVar('template_profiler_stack', default=None)
+
+
+class TemplateProfiler:
+    """Cumulative render time per template, `{% include %}` and `{% url %}`.
+
+    Timings are aggregated across requests in-process. `folded()` returns
+    the self time of every render stack in the collapsed format read by
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._originals = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = defaultdict(lambda: [0, 0.0, 0.0])
+            self.stacks = defaultdict(float)
+
+    @property
+    def installed(self):
+        return bool(self._originals)
+
+    def install(self):
+        if self.installed:
+            return
+        targets = (
+            (Template, '_render', self._template_key),
+            (Node, 'render_annotated', self._node_key),
+        )
+        for cls, attr, key in targets:
+            original = getattr(cls, attr)
+            self._originals[cls, attr] = original
+            setattr(cls, attr, self._wrap(original, key))
+
+    def uninstall(self):
+        for (cls, attr), original in self._originals.items():
+            setattr(cls, attr, original)
+        self._originals.clear()
+
+    @staticmethod
+    def _template_key(template):
+        if template.origin and template.origin.template_name:
+            return template.origin.template_name
+        return template.name or '<string>'
+
+    @staticmethod
+    def _node_key(node):
+        if isinstance(node, IncludeNode):
+            return f'include {node.template.token}'
+        if isinstance(node, URLNode):
+            return f'url {node.view_name.token}'
+        return None
+
+    def _wrap(self, method, key):
+        profiler = self
+
+        @functools.wraps(method)
+        def wrapper(self, context, *args, **kwargs):
+            name = key(self)
+            if name is None:
+                return method(self, context, *args, **kwargs)
+            stack = _stack.get()
+            if stack is None:
+                stack = []
+                _stack.set(stack)
+            frame = [name, 0.0]
+            stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return method(self, context, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                path = ';'.join(name for name, _ in stack)
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                profiler._add(frame[0], path, elapsed, elapsed - frame[1])
+        return wrapper
+
+    def _add(self, name, path, elapsed, self_time):
+        with self._lock:
+            stats = self.stats[name]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += self_time
+            self.stacks[path] += self_time
+
+    def top(self, limit=None):
+        with self._lock:
+            rows = [
+                {
+                    'name': name,
+                    'calls': calls,
+                    'cumulative_ms': round(cumulative * 1000, 3),
+                    'self_ms': round(self_time * 1000, 3),
+                }
+                for name, (calls, cumulative, self_time) in self.stats.items()
+            ]
+        rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+        return rows[:limit]
+
+    def folded(self):
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        return ''.join(
+            f'{path} {round(self_time * 1_000_000)}\n'
+            for path, self_time in stacks
+        )
+
+    def dump_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(self.folded())
+
+
+profiler = TemplateProfiler()
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'perf'
+
+urlpatterns = [
+    path('slow-queries/', views.slow_queries, name='slow_queries'),
+    path('templates/', views.template_profile, name='template_profile'),
+    path('templates/reset/',
+         views.template_profile_reset,
+         name='template_profile_reset'),
+    path('pools/', views.connection_pools, name='connection_pools'),
+    path('ratelimits/', views.rate_limits, name='rate_limits'),
+]
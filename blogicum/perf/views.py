@@ -0,0 +1,68 @@
+import os
+
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.http import require_POST
+
+from .pool import pools
+from .ratelimit import limiter
+from .slow_queries import store
+from .template_profiler import profiler
+
+SLOW_QUERY_ORDERINGS = ('total_ms', 'p95_ms', 'max_ms', 'count')
+
+
+@staff_member_required
+def slow_queries(request):
+    order_by = request.GET.get('o')
+    if order_by not in SLOW_QUERY_ORDERINGS:
+        order_by = 'total_ms'
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Медленные запросы',
+        'pid': os.getpid(),
+        'queries': store.top(limit=50, order_by=order_by),
+        'orderings': SLOW_QUERY_ORDERINGS,
+        'order_by': order_by,
+    }
+    return render(request, 'perf/slow_queries.html', context)
+
+
+@staff_member_required
+def template_profile(request):
+    if request.GET.get('format') == 'folded':
+        response = HttpResponse(
+            profiler.folded(), content_type='text/plain; charset=utf-8'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="templates.folded"'
+        )
+        return response
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Профиль рендеринга шаблонов',
+        'installed': profiler.installed,
+        'rows': profiler.top(),
+    }
+    return render(request, 'perf/template_profile.html', context)
+
+
+@staff_member_required
+@require_POST
+def template_profile_reset(request):
+    profiler.reset()
+    return redirect('perf:template_profile')
+
+
+@staff_member_required
+def connection_pools(request):
+    return JsonResponse(
+        {alias: pool.stats() for alias, pool in pools.items()}
+    )
+
+
+@staff_member_required
+def rate_limits(request):
+    return JsonResponse(limiter.stats())
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,33 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    from perf.ratelimit import limiter
+
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def hold_view_counts():
+    """Views counted by a test are never written behind its back."""
+    from blog.view_counts import view_counter
+
+    view_counter.reset()
+    with override_settings(VIEW_COUNT_FLUSH_SECONDS=None):
+        yield
+    view_counter.reset()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +120,8 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.nplusone",
+    "fixtures.replicas",
     "adapters.comment",
 ]
 
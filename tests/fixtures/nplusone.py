@@ -0,0 +1,29 @@
+import pytest
+
+from perf.nplusone import detect_nplusone
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "nplusone(threshold=None): fail the test if it issues repeated"
+        " queries of the same shape",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("nplusone")
+    if marker is None:
+        yield
+        return
+    with detect_nplusone(
+        threshold=marker.kwargs.get("threshold"), label=item.nodeid
+    ):
+        outcome = yield
+        outcome.get_result()
+
+
+@pytest.fixture
+def nplusone_guard():
+    return detect_nplusone
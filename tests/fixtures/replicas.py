@@ -0,0 +1,42 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class SqliteReplica:
+    """A second SQLite file routed as the read replica.
+
+    It only changes when `sync()` copies the primary into it, so the
+    time between a write and the next `sync()` is replication lag.
+    """
+
+    alias = "replica"
+
+    def __init__(self, path):
+        self.path = path
+
+    def sync(self):
+        connections[self.alias].close()
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        with closing(sqlite3.connect(self.path)) as target:
+            primary.connection.backup(target)
+
+
+@pytest.fixture
+def sqlite_replica(tmp_path, settings):
+    """Needs `django_db(transaction=True)`: the copy only sees committed
+    rows of the primary."""
+    replica = SqliteReplica(str(tmp_path / "replica.sqlite3"))
+    connections.settings[replica.alias] = {
+        **connections.settings[DEFAULT_DB_ALIAS],
+        "NAME": replica.path,
+    }
+    settings.DATABASE_REPLICAS = [replica.alias]
+    replica.sync()
+    yield replica
+    connections[replica.alias].close()
+    del connections[replica.alias]
+    del connections.settings[replica.alias]
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize("url, model", [
+    ("/admin/blog/post/", "blog.Post"),
+    ("/admin/blog/comment/", "blog.Comment"),
+])
+def test_changelist_queries_do_not_grow_with_rows(
+        mixer, admin_client, url, model
+):
+    mixer.cycle(3).blend(model)
+    _, few = changelist_queries(admin_client, url)
+    mixer.cycle(20).blend(model)
+    response, many = changelist_queries(admin_client, url)
+    assert many == few, (
+        "Убедитесь, что число запросов на странице списка в админке не"
+        " зависит от числа строк."
+    )
+    content = response.content.decode()
+    assert content.count("<option") <= 2 * 23, (
+        "Убедитесь, что поля-связи в списке не выводят всех пользователей"
+        " в `<select>`."
+    )
+
+
+def test_user_autocomplete_uses_prefix(mixer, admin_client):
+    mixer.blend("auth.User", username="leonid")
+    mixer.blend("auth.User", username="maria", first_name="leonid")
+    response = admin_client.get(
+        "/admin/autocomplete/",
+        {
+            "term": "leo",
+            "app_label": "blog",
+            "model_name": "post",
+            "field_name": "author",
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [item["text"] for item in response.json()["results"]] == [
+        "leonid"
+    ]
+
+
+def test_change_forms_render(mixer, admin_client):
+    comment = mixer.blend("blog.Comment")
+    for url in (
+        "/admin/blog/post/add/",
+        f"/admin/blog/post/{comment.post_id}/change/",
+        f"/admin/blog/comment/{comment.pk}/change/",
+    ):
+        assert admin_client.get(url).status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize("url, model", [
+    ("/admin/blog/post/", "blog.Post"),
+    ("/admin/blog/comment/", "blog.Comment"),
+])
+def test_changelist_shows_only_text_preview(mixer, admin_client, url, model):
+    mixer.blend(model, text="начало " + "x" * 500 + " конец")
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get(url)
+    content = response.content.decode()
+    assert "начало" in content and "конец" not in content, (
+        "Убедитесь, что в списке в админке выводится только начало текста."
+    )
+    selects = [
+        query["sql"].replace('SUBSTR("', "")
+        for query in ctx.captured_queries
+        if "SUBSTR" in query["sql"]
+    ]
+    assert selects and all(
+        '"blog_post"."text"' not in sql and '"blog_comment"."text"' not in sql
+        for sql in selects
+    ), "Убедитесь, что список в админке не загружает поле `text` целиком."
+
+
+def test_estimated_count_paginator(mixer):
+    from blog.admin import EstimatedCountPaginator
+    from blog.models import Post
+
+    mixer.cycle(5).blend("blog.Post")
+    queryset = Post.objects.order_by("pk")
+
+    class SmallLimitPaginator(EstimatedCountPaginator):
+        exact_count_limit = 2
+
+    last = queryset.last()
+    last.pk = last.pk + 100
+    last.save()
+    assert SmallLimitPaginator(queryset, 10).count == last.pk
+    assert EstimatedCountPaginator(queryset, 10).count == 6
+    filtered = queryset.filter(pk__lte=last.pk)
+    assert SmallLimitPaginator(filtered, 10).count == 6
+
+
+@pytest.mark.parametrize("url, model", [
+    ("/admin/blog/post/", "blog.Post"),
+    ("/admin/blog/comment/", "blog.Comment"),
+])
+def test_text_edit_view(mixer, admin_client, url, model):
+    obj = mixer.blend(model, text="старый текст")
+    text_url = f"{url}{obj.pk}/text/"
+    assert f'href="{text_url}"' in admin_client.get(url).content.decode(), (
+        "Убедитесь, что превью текста в списке ведёт на страницу"
+        " редактирования текста."
+    )
+    response = admin_client.get(text_url)
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert "старый текст" in content and "<select" not in content, (
+        "Убедитесь, что страница редактирования текста выводит только"
+        " поле `text`."
+    )
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.post(text_url, {"text": "новый текст"})
+    assert response.status_code == HTTPStatus.FOUND
+    obj.refresh_from_db()
+    assert obj.text == "новый текст"
+    table = obj._meta.db_table
+    assert [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith(f'UPDATE "{table}"')
+    ] == [
+        f'UPDATE "{table}" SET "text" = \'новый текст\''
+        f' WHERE "{table}"."id" = {obj.pk}'
+    ], "Убедитесь, что страница редактирования текста обновляет только его."
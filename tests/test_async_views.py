@@ -0,0 +1,107 @@
+import asyncio
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory, override_settings
+
+from blog import async_views, views
+from blog.models import Post
+from perf.instrumentation import wrap_queries
+from perf.middleware import QueryTimingMiddleware
+from perf.nplusone import NPlusOneDetector
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def get(view, url, user=None, **kwargs):
+    request = RequestFactory().get(url)
+    request.user = user or AnonymousUser()
+    response = view(request, **kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response.content.decode()
+
+
+@pytest.fixture
+def feed(mixer, published_category):
+    return mixer.cycle(13).blend(
+        "blog.Post", category=published_category, is_published=True,
+        pub_date="2020-01-01T00:00:00Z",
+    )
+
+
+@pytest.mark.parametrize("url", ["/", "/?page=2", "/?page=last"])
+def test_index_matches_sync_view(feed, url):
+    assert get(async_to_sync(async_views.index), url) == get(
+        views.BlogListView.as_view(), url
+    )
+
+
+def test_category_and_profile_match_sync_views(feed, published_category):
+    slug = published_category.slug
+    assert get(
+        async_to_sync(async_views.category_posts), "/", category_slug=slug
+    ) == get(views.CategoryListView.as_view(), "/", category_slug=slug)
+    author = feed[0].author
+    for url in ("/", "/?page=9", "/?page=x"):
+        assert get(
+            async_to_sync(async_views.profile), url, username=author.username
+        ) == get(views.get_profile, url, username=author.username)
+
+
+def test_post_detail_visibility(feed):
+    post = feed[0]
+    view = async_to_sync(async_views.post_detail)
+    assert post.title in get(view, "/", post_id=post.pk)
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    with pytest.raises(Http404):
+        get(view, "/", post_id=post.pk)
+    assert post.title in get(view, "/", user=post.author, post_id=post.pk)
+    with pytest.raises(Http404):
+        get(view, "/", post_id=post.pk + 1000)
+
+
+@pytest.mark.parametrize("url", ["/?page=0", "/?page=5", "/?page=x"])
+def test_index_invalid_pages(feed, url):
+    with pytest.raises(Http404):
+        get(async_to_sync(async_views.index), url)
+
+
+def test_detail_404_skips_comments(feed):
+    Post.objects.filter(pk=feed[0].pk).update(is_published=False)
+    detector = NPlusOneDetector(threshold=1000)
+    with wrap_queries(detector), pytest.raises(Http404):
+        get(async_to_sync(async_views.post_detail), "/", post_id=feed[0].pk)
+    assert not any("blog_comment" in sql for sql in detector.seen), (
+        "Убедитесь, что комментарии к недоступному посту не запрашиваются."
+    )
+
+
+def test_instrumentation_sees_worker_thread_queries(feed):
+    detector = NPlusOneDetector(threshold=1000)
+    with wrap_queries(detector):
+        get(async_to_sync(async_views.index), "/")
+    assert sum(count for count, _ in detector.seen.values()) >= 2, (
+        "Убедитесь, что обёртки запросов видят запросы, выполненные"
+        " асинхронными представлениями в рабочих потоках."
+    )
+
+
+@override_settings(QUERY_TIMING=True)
+def test_middleware_runs_natively_async(feed):
+    async def get_response(request):
+        return await async_views.index(request)
+
+    middleware = QueryTimingMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware), (
+        "Убедитесь, что в асинхронной цепочке middleware не переключается"
+        " в синхронный поток."
+    )
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    response = async_to_sync(middleware)(request)
+    match = re.search(r'desc="(\d+) queries"', response["Server-Timing"])
+    assert int(match.group(1)) >= 2
@@ -0,0 +1,159 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import stats
+from blog.bulk import bulk_update
+from blog.models import AuthorStats, Category, Post
+from blog.signals import post_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+def counts(user):
+    row = AuthorStats.objects.get(user=user)
+    return row.published_posts, row.total_posts, row.comments
+
+
+def test_profile_shows_stats_without_counting(
+        user, client, mixer, published_category
+):
+    mixer.cycle(3).blend("blog.Post", author=user, category=published_category)
+    mixer.blend("blog.Post", author=user, is_published=False)
+    mixer.cycle(2).blend("blog.Comment", author=user)
+    url = f"/profile/{user.username}/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        content = client.get(url).content.decode()
+    assert "Публикаций: 3" in content and "Комментариев: 2" in content
+    assert not any(
+        'GROUP BY "blog_comment"."author_id"' in query["sql"]
+        or 'GROUP BY "blog_post"."author_id"' in query["sql"]
+        for query in ctx.captured_queries
+    ), "Убедитесь, что страница профиля не пересчитывает статистику автора."
+
+
+def test_stats_follow_posts_and_comments(
+        user, another_user, mixer, published_category
+):
+    stats.get(user)
+    stats.get(another_user)
+    post = mixer.blend("blog.Post", author=user, category=published_category)
+    hidden = mixer.blend("blog.Post", author=user, is_published=False)
+    assert counts(user) == (1, 2, 0)
+    assert AuthorStats.objects.get(user=user).last_post_date == post.pub_date
+
+    comment = mixer.blend("blog.Comment", author=user, post=post)
+    assert counts(user) == (1, 2, 1)
+    comment.delete()
+    assert counts(user) == (1, 2, 0)
+
+    hidden.author = another_user
+    hidden.save()
+    assert counts(user) == (1, 1, 0)
+    assert counts(another_user) == (0, 1, 0)
+    post.delete()
+    assert counts(user) == (0, 0, 0)
+
+
+def test_stats_follow_categories(user, mixer, published_category):
+    mixer.cycle(2).blend("blog.Post", author=user, category=published_category)
+    stats.get(user)
+    bulk_update(
+        Category.objects.filter(pk=published_category.pk), is_published=False
+    )
+    assert counts(user) == (0, 2, 0)
+    published_category.is_published = True
+    published_category.save()
+    assert counts(user) == (2, 2, 0)
+    published_category.delete()
+    assert counts(user) == (0, 2, 0)
+
+
+def test_scheduled_post_counted_when_published(
+        user, mixer, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    assert counts(user) == (0, 1, 0)
+    # Time passes: nothing is saved, the scheduler sends the event.
+    Post.objects.filter(pk=post.pk).update(pub_date=timezone.now())
+    post_published.send(sender=Post, instance=post)
+    assert counts(user) == (1, 1, 0)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deleting_author_drops_stats(mixer):
+    user = mixer.blend("auth.User")
+    post = mixer.blend("blog.Post", author=user)
+    mixer.blend("blog.Comment", author=user, post=post)
+    stats.get(user)
+    user.delete()
+    assert not AuthorStats.objects.filter(user_id=user.pk).exists()
+
+
+def test_unrelated_post_edit_does_not_recount(
+        user, mixer, published_category
+):
+    post = mixer.blend("blog.Post", author=user, category=published_category)
+    stats.get(user)
+    post = Post.objects.get(pk=post.pk)
+    post.title = "Новый заголовок"
+    with CaptureQueriesContext(connection) as ctx:
+        post.save()
+    assert not any(
+        '"blog_authorstats"' in query["sql"] or "GROUP BY" in query["sql"]
+        for query in ctx.captured_queries
+    ), (
+        "Убедитесь, что статистика автора не пересчитывается, если пост"
+        " изменён без смены автора, категории и публикации."
+    )
+    post.is_published = False
+    post.save()
+    assert counts(user) == (0, 1, 0)
+
+
+def test_scheduled_post_counted_without_scheduler(
+        user, mixer, published_category
+):
+    now = timezone.now()
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=now + timedelta(hours=1),
+    )
+    assert stats.get(user).published_posts == 0
+    with mock.patch(
+        "django.utils.timezone.now", return_value=now + timedelta(hours=2)
+    ):
+        row = stats.get(user)
+    assert (row.published_posts, row.next_publication) == (1, None), (
+        "Убедитесь, что отложенный пост учитывается в статистике автора"
+        " после наступления даты публикации, даже если планировщик не"
+        " запущен."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_profile_on_lagging_replica_keeps_stats(
+        user, client, mixer, published_category, sqlite_replica
+):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    assert counts(user)[:2] == (1, 1)
+    response = client.get(f"/profile/{user.username}/")
+    assert response.status_code == HTTPStatus.OK
+    assert counts(user)[:2] == (1, 1), (
+        "Убедитесь, что статистика автора считается по основной базе, а не"
+        " по отстающей реплике."
+    )
+    assert response.context["page_obj"].paginator.count == 1
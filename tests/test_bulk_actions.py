@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import stats
+from blog.bulk import bulk_update, iter_pk_batches
+from blog.lookups import published_categories
+from blog.models import Category, Comment, FeedEntry, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def run_action(admin_client, url, action, objects):
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.post(url, {
+            "action": action,
+            "_selected_action": [obj.pk for obj in objects],
+        })
+    assert response.status_code == HTTPStatus.FOUND
+    return ctx.captured_queries
+
+
+def write_queries(queries, table):
+    # Writes to `table` only: the feed refresh writes `blog_feedentry`.
+    return [
+        query["sql"] for query in queries
+        if query["sql"].startswith(
+            (f'UPDATE "{table}"', f'DELETE FROM "{table}"')
+        )
+    ]
+
+
+def test_unpublish_posts_is_one_update(mixer, admin_client):
+    posts = mixer.cycle(12).blend("blog.Post", is_published=True)
+    queries = run_action(
+        admin_client, "/admin/blog/post/", "unpublish_selected", posts
+    )
+    assert len(write_queries(queries, "blog_post")) == 1, (
+        "Убедитесь, что снятие с публикации выполняется одним `UPDATE`."
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    run_action(admin_client, "/admin/blog/post/", "publish_selected", posts)
+    assert Post.objects.filter(is_published=True).count() == 12
+
+
+def test_unpublish_category_invalidates_lookup(
+        admin_client, client, published_category
+):
+    url = f"/category/{published_category.slug}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    run_action(
+        admin_client, "/admin/blog/category/", "unpublish_selected",
+        [published_category],
+    )
+    assert published_categories.get(published_category.slug) is None
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_bulk_delete_comments(mixer, admin_client):
+    comments = mixer.cycle(5).blend("blog.Comment")
+    run_action(
+        admin_client, "/admin/blog/comment/", "bulk_delete_selected",
+        comments[:3],
+    )
+    assert Comment.objects.count() == 2
+
+
+def test_bulk_delete_posts_is_set_based(
+        mixer, admin_client, user, another_user,
+        many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations
+    mixer.cycle(4).blend("blog.Comment", post=posts[0], author=another_user)
+    stats.get(user)
+    stats.get(another_user)
+    queries = run_action(
+        admin_client, "/admin/blog/post/", "bulk_delete_selected", posts[:-1]
+    )
+    assert len(write_queries(queries, "blog_post")) == 1, (
+        "Убедитесь, что пакетное удаление публикаций выполняется одним"
+        " `DELETE` без загрузки строк."
+    )
+    assert len(write_queries(queries, "blog_comment")) == 1
+    assert list(Post.objects.all()) == posts[-1:]
+    assert not Comment.objects.exists()
+    assert list(FeedEntry.objects.values_list("post_id", flat=True)) == [
+        posts[-1].pk
+    ]
+    assert stats.get(user).total_posts == 1
+    assert stats.get(another_user).comments == 0
+
+
+def test_bulk_delete_keeps_counters(
+        mixer, admin_client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post, author=another_user
+    )
+    stats.get(another_user)
+    run_action(
+        admin_client, "/admin/blog/comment/", "bulk_delete_selected",
+        comments[:2],
+    )
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 1
+    assert stats.get(another_user).comments == 1
+    run_action(
+        admin_client, "/admin/blog/location/", "bulk_delete_selected",
+        [post.location],
+    )
+    assert not Location.objects.exists()
+    assert Post.objects.get(pk=post.pk).location is None
+    assert FeedEntry.objects.get(pk=post.pk).location_name is None
+
+
+def test_bulk_update_runs_in_batches(mixer):
+    mixer.cycle(7).blend("blog.Category", is_published=True)
+    queryset = Category.objects.filter(is_published=True)
+    assert [len(batch) for batch in iter_pk_batches(queryset, 3)] == [3, 3, 1]
+    with CaptureQueriesContext(connection) as ctx:
+        assert bulk_update(queryset, batch_size=3, is_published=False) == 7
+    assert len(write_queries(ctx.captured_queries, "blog_category")) == 3
+    assert not queryset.exists()
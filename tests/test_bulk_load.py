@@ -0,0 +1,89 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.fixture_import import iter_json_array
+from blog.models import Category, Location, Post, User
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 1 << 16])
+def test_iter_json_array_matches_json_load(read_size):
+    items = [
+        {"text": "a, ] [ } {\\", "n": [1, 2.5, None]},
+        [],
+        "строка",
+        {},
+    ]
+    source = json.dumps(items, ensure_ascii=False, indent=2)
+    assert list(iter_json_array(io.StringIO(source), read_size)) == items
+    assert list(iter_json_array(io.StringIO(" [ ] "), read_size)) == []
+    scalars = [12345, -1.5e10, True, None, 7]
+    assert list(
+        iter_json_array(io.StringIO(json.dumps(scalars)), read_size)
+    ) == scalars, (
+        "Убедитесь, что число или литерал на границе прочитанного блока"
+        " не обрезается."
+    )
+
+
+@pytest.mark.parametrize("source", ['{"a": 1}', '[{"a": 1}', '[1 2]'])
+def test_iter_json_array_rejects_broken_input(source):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(source), 2))
+
+
+@pytest.mark.django_db
+def test_bulk_load_db_json():
+    fixture = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    out = io.StringIO()
+    call_command("bulk_load", str(DB_JSON), batch_size=10, stdout=out)
+    expected = {
+        model: [obj for obj in fixture if obj["model"] == label]
+        for model, label in (
+            (User, "auth.user"), (Category, "blog.category"),
+            (Location, "blog.location"), (Post, "blog.post"),
+        )
+    }
+    for model, objects in expected.items():
+        assert model.objects.count() == len(objects)
+    post = Post.objects.get(pk=expected[Post][0]["pk"])
+    assert post.created_at.isoformat().startswith(
+        expected[Post][0]["fields"]["created_at"][:19]
+    ), "Убедитесь, что при загрузке сохраняется исходное `created_at`."
+    assert "admin.logentry: 75 (пропущено)" in out.getvalue()
+    assert "строк/с" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_bulk_load_resolves_order_and_checks_keys(tmp_path, mixer):
+    author = mixer.blend("auth.User")
+    post = {
+        "model": "blog.post", "pk": 1,
+        "fields": {
+            "created_at": "2022-12-18T23:03:52Z", "is_published": True,
+            "title": "t", "text": "t", "pub_date": "2022-12-18T23:03:52Z",
+            "author": author.pk, "category": 5, "location": None,
+        },
+    }
+    category = {
+        "model": "blog.category", "pk": 5,
+        "fields": {
+            "created_at": "2022-12-18T23:03:52Z", "is_published": True,
+            "title": "c", "slug": "c", "description": "d",
+        },
+    }
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(json.dumps([post, category]))
+    call_command("bulk_load", str(fixture), stdout=io.StringIO())
+    assert Post.objects.get().category_id == 5
+
+    post["pk"], post["fields"]["category"] = 2, 999
+    fixture.write_text(json.dumps([post]))
+    with pytest.raises(CommandError):
+        call_command("bulk_load", str(fixture), stdout=io.StringIO())
+    assert not Post.objects.filter(pk=2).exists()
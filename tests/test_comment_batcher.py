@@ -0,0 +1,133 @@
+import threading
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import override_settings
+
+from blog import stats
+from blog.comment_batcher import CommentBatcher, _Pending, comment_batcher
+from blog.models import Comment, FeedEntry, Post
+
+# The writer thread has a connection of its own and must see the data.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def batcher():
+    batcher = CommentBatcher(window_ms=100)
+    yield batcher
+    batcher.stop()
+
+
+def submit_all(batcher, comments):
+    errors = {}
+
+    def submit(comment):
+        try:
+            batcher.submit(comment)
+        except Exception as error:
+            errors[comment.text] = error
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=submit, args=(comment,))
+        for comment in comments
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_comments_committed_in_groups(
+        batcher, user, post_with_published_location
+):
+    post = post_with_published_location
+    stats.get(user)
+    errors = submit_all(batcher, [
+        Comment(post=post, author=user, text=str(number))
+        for number in range(12)
+    ])
+    assert not errors
+    assert Comment.objects.filter(post=post).count() == 12
+    assert batcher.batches < 12, (
+        "Убедитесь, что одновременно отправленные комментарии сохраняются"
+        " общими пакетами."
+    )
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 12
+    assert stats.get(user).comments == 12
+
+
+def test_batch_rejects_only_bad_comments(
+        batcher, mixer, user, another_user, post_with_published_location
+):
+    hidden = mixer.blend("blog.Post", author=user, is_published=False)
+    errors = submit_all(batcher, [
+        Comment(post=post_with_published_location, author=another_user,
+                text="ok"),
+        Comment(post=hidden, author=user, text="own"),
+        Comment(post=hidden, author=another_user, text="hidden"),
+        Comment(post=post_with_published_location, author_id=10 ** 6,
+                text="broken"),
+    ])
+    assert set(errors) == {"hidden", "broken"}
+    assert isinstance(errors["hidden"], Post.DoesNotExist)
+    assert set(Comment.objects.values_list("text", flat=True)) == {
+        "ok", "own"
+    }, (
+        "Убедитесь, что ошибочный комментарий не мешает сохранить"
+        " остальные комментарии пакета."
+    )
+
+
+@override_settings(COMMENT_GROUP_COMMIT=True)
+def test_add_comment_with_group_commit(
+        user_client, another_user_client, mixer, user,
+        post_with_published_location
+):
+    hidden = mixer.blend("blog.Post", author=user, is_published=False)
+    try:
+        url = f"/posts/{post_with_published_location.id}/comment/"
+        response = another_user_client.post(url, {"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.FOUND
+        assert another_user_client.post(
+            f"/posts/{hidden.id}/comment/", {"text": "Комментарий"}
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert user_client.post(
+            f"/posts/{hidden.id}/comment/", {"text": "Свой"}
+        ).status_code == HTTPStatus.FOUND
+    finally:
+        comment_batcher.stop()
+    assert Comment.objects.count() == 2
+
+
+def test_withdrawn_comment_is_not_written(
+        batcher, user, post_with_published_location
+):
+    pending = _Pending(
+        Comment(post=post_with_published_location, author=user, text="late")
+    )
+    assert pending.withdraw()
+    batcher.flush([pending])
+    assert not Comment.objects.exists(), (
+        "Убедитесь, что комментарий, не дождавшийся записи, не сохраняется"
+        " позже."
+    )
+    assert not pending.take()
+
+
+@override_settings(COMMENT_GROUP_COMMIT=True)
+def test_add_comment_timeout_asks_to_retry(
+        another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    with mock.patch.object(
+        comment_batcher, "submit", side_effect=TimeoutError
+    ):
+        response = another_user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response["Retry-After"]
@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+import time
+from unittest import mock
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from perf.backends.pooled_sqlite3.base import DatabaseWrapper
+from perf.pool import ConnectionPool, PoolTimeout, pools
+from perf.sqlite import apply_pragmas
+
+
+def connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_pool_reuses_connections():
+    pool = ConnectionPool(max_size=2)
+    first, reused = pool.acquire(connect)
+    assert not reused
+    pool.release(first)
+    second, reused = pool.acquire(connect)
+    assert reused and second is first
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_pool_limits_size_and_waits():
+    pool = ConnectionPool(max_size=1, timeout=0.05)
+    held, _ = pool.acquire(connect)
+    with pytest.raises(PoolTimeout):
+        pool.acquire(connect)
+    pool.timeout = 5
+    timer = threading.Timer(0.05, pool.release, [held])
+    timer.start()
+    again, reused = pool.acquire(connect)
+    timer.join()
+    assert reused and again is held
+    assert pool.stats()["waits"] >= 2
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_pool_recycles_and_checks_health():
+    pool = ConnectionPool(max_age=0)
+    old, _ = pool.acquire(connect)
+    pool.release(old)
+    assert pool.stats()["recycled"] == 1 and pool.stats()["size"] == 0
+
+    pool = ConnectionPool()
+    broken, _ = pool.acquire(connect)
+    pool.release(broken)
+    broken.close()
+    fresh, reused = pool.acquire(connect)
+    assert not reused and fresh is not broken
+    assert pool.stats()["discarded"] == 1
+
+
+def test_pool_checks_health_outside_lock(monkeypatch):
+    pool = ConnectionPool()
+    conn, _ = pool.acquire(connect)
+    pool.release(conn)
+    checking, done = threading.Event(), threading.Event()
+
+    def slow_check(connection):
+        checking.set()
+        done.wait(5)
+        return True
+
+    monkeypatch.setattr(pool, "_healthy", slow_check)
+    thread = threading.Thread(target=pool.acquire, args=(connect,))
+    thread.start()
+    try:
+        assert checking.wait(5)
+        started = time.monotonic()
+        other, reused = pool.acquire(connect)
+        assert not reused and time.monotonic() - started < 1, (
+            "Убедитесь, что проверка соединения выполняется без блокировки"
+            " пула: остальные потоки не должны её ждать."
+        )
+    finally:
+        done.set()
+        thread.join()
+    assert pool.stats()["hits"] == 1
+
+
+def test_pool_rolls_back_released_transactions():
+    pool = ConnectionPool()
+    conn, _ = pool.acquire(connect)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    assert conn.in_transaction
+    pool.release(conn)
+    conn, _ = pool.acquire(connect)
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+
+
+def use_pooled_connection(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute("SELECT django_date_extract('year', ?)",
+                       ["2023-05-01"])
+        assert cursor.fetchone() == (2023,)
+        cursor.execute("PRAGMA journal_mode")
+        assert cursor.fetchone() == ("wal",)
+        cursor.execute("PRAGMA foreign_keys")
+        assert cursor.fetchone() == (1,), (
+            "Убедитесь, что `foreign_keys` включается заново у соединения,"
+            " взятого из пула."
+        )
+        cursor.execute("PRAGMA foreign_keys = OFF")
+    wrapper.close()
+
+
+@pytest.mark.django_db
+def test_pooled_backend_returns_connections_to_pool(tmp_path, settings):
+    settings.SQLITE_PRAGMAS = "production"
+    wrapper = DatabaseWrapper(
+        {
+            **connection.settings_dict,
+            "NAME": str(tmp_path / "db.sqlite3"),
+            "POOL": {"MAX_SIZE": 2},
+        },
+        alias="pooled",
+    )
+    try:
+        with mock.patch(
+            "perf.sqlite.apply_pragmas", wraps=apply_pragmas
+        ) as applied:
+            for _ in range(3):
+                use_pooled_connection(wrapper)
+        assert applied.call_count == 1, (
+            "Убедитесь, что профиль прагм применяется только к новому"
+            " соединению, а не при каждой выдаче из пула."
+        )
+        stats = pools["pooled"].stats()
+        assert (stats["misses"], stats["hits"]) == (1, 2)
+        assert stats["idle"] == 1
+    finally:
+        pools.pop("pooled").close_idle()
+
+
+def test_pool_stats_view(admin_client, client):
+    url = "/admin/perf/pools/"
+    assert client.get(url).status_code == HTTPStatus.FOUND
+    response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert isinstance(response.json(), dict)
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.export import iter_chunks
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_iter_chunks_pages_by_pk(mixer):
+    posts = mixer.cycle(5).blend("blog.Post")
+    with CaptureQueriesContext(connection) as ctx:
+        chunks = list(iter_chunks("posts", chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert len(ctx.captured_queries) == 4, (
+        "Убедитесь, что выгрузка делает один запрос на пакет, вместе со"
+        " связанными автором, категорией и местоположением."
+    )
+    first = chunks[0][0]
+    assert first["id"] == min(post.pk for post in posts)
+    assert first["author"] == posts[0].author.username
+    resumed = list(iter_chunks("posts", after=chunks[1][-1]["id"]))
+    assert resumed == [chunks[2]]
+
+
+def test_export_command_resumes_from_checkpoint(mixer, tmp_path):
+    comments = mixer.cycle(5).blend("blog.Comment")
+    output = tmp_path / "comments.ndjson"
+    checkpoint = tmp_path / "comments.checkpoint"
+    options = {
+        "output": str(output), "checkpoint": str(checkpoint),
+        "chunk_size": 2, "stderr": io.StringIO(),
+    }
+    call_command("export_blog", "comments", **options)
+    assert checkpoint.read_text() == str(comments[-1].pk)
+    checkpoint.write_text(str(comments[2].pk))
+    output.write_text(
+        "".join(output.read_text().splitlines(keepends=True)[:3])
+    )
+    call_command("export_blog", "comments", **options)
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["id"] for row in rows] == [c.pk for c in comments]
+    assert rows[0]["post"] == comments[0].post_id
+
+
+def test_export_command_csv(mixer):
+    mixer.cycle(3).blend("blog.Post", text="строка 1\nстрока 2")
+    out = io.StringIO()
+    call_command(
+        "export_blog", "posts", format="csv", stdout=out,
+        stderr=io.StringIO(),
+    )
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0][:3] == ["id", "title", "text"]
+    assert len(rows) == 4
+    assert rows[1][2] == "строка 1\nстрока 2"
+
+
+def test_export_view_is_staff_only(admin_client, user_client, mixer):
+    mixer.cycle(3).blend("blog.Post")
+    url = "/export/posts/"
+    assert user_client.get(url).status_code == HTTPStatus.FOUND
+    response = admin_client.get(url, {"format": "csv"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming
+    body = b"".join(response.streaming_content).decode()
+    assert len(list(csv.reader(io.StringIO(body)))) == 4
+    assert admin_client.get("/export/users/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert admin_client.get(url, {"after": "x"}).status_code == (
+        HTTPStatus.BAD_REQUEST
+    )
@@ -0,0 +1,59 @@
+import pytest
+from django.template import Context, Template
+from django.urls import NoReverseMatch, reverse
+
+from blog.reverse import _format_cached, fast_reverse
+
+
+@pytest.mark.parametrize(
+    "viewname, args, kwargs",
+    [
+        ("blog:index", None, None),
+        ("blog:post_detail", [5], None),
+        ("blog:post_detail", None, {"post_id": 5}),
+        ("blog:edit_comment", [1, 2], None),
+        ("blog:profile", ["имя пользователя"], None),
+        ("blog:category_posts", None, {"category_slug": "travel-2"}),
+        ("pages:about", None, None),
+        ("login", None, None),
+    ],
+)
+def test_fast_reverse_matches_reverse(viewname, args, kwargs):
+    assert fast_reverse(viewname, args=args, kwargs=kwargs) == reverse(
+        viewname, args=args, kwargs=kwargs
+    )
+
+
+@pytest.mark.parametrize(
+    "viewname, args",
+    [
+        ("blog:post_detail", ["not-a-number"]),
+        ("blog:profile", ["with/slash"]),
+        ("blog:post_detail", []),
+        ("blog:missing", []),
+    ],
+)
+def test_fast_reverse_raises_like_reverse(viewname, args):
+    with pytest.raises(NoReverseMatch):
+        fast_reverse(viewname, args=args)
+
+
+def test_fast_reverse_is_memoized():
+    _format_cached.cache_clear()
+    fast_reverse("blog:post_detail", args=[7])
+    fast_reverse("blog:post_detail", args=[7])
+    info = _format_cached.cache_info()
+    assert info.hits == 1 and info.maxsize
+
+
+def test_fast_url_tag_is_drop_in():
+    context = Context({"post_id": 3, "slug": "a&b"})
+    source = (
+        "{% url 'blog:post_detail' post_id %}|"
+        "{% url 'blog:post_detail' post_id=post_id %}|"
+        "{% url 'pages:rules' %}|"
+        "{% url 'blog:missing' as missing %}{{ missing }}|"
+        "{% url 'blog:profile' slug %}"
+    )
+    fast = Template("{% load fast_url %}" + source).render(context)
+    assert fast == Template(source).render(context)
@@ -0,0 +1,94 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+
+from blog.bulk import bulk_update
+from blog.models import Category, FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_reads_only_feed(client, many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/")
+    blog_queries = [
+        query["sql"] for query in ctx.captured_queries
+        if '"blog_' in query["sql"]
+    ]
+    assert blog_queries and all(
+        '"blog_feedentry"' in sql and "JOIN" not in sql
+        for sql in blog_queries
+    ), (
+        "Убедитесь, что главная страница читает только таблицу ленты,"
+        " без соединений с публикациями и комментариями."
+    )
+    newest = max(many_posts_with_published_locations, key=lambda post: (
+        post.pub_date, post.pk
+    ))
+    assert newest.title in response.content.decode()
+
+
+def test_entry_renders_like_post(post_with_published_location, mixer):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    post = Post.objects.annotate(
+        comment_count=Count("comments")
+    ).get(pk=post_with_published_location.pk)
+    entry = FeedEntry.objects.get(pk=post.pk)
+    assert render_to_string(
+        "includes/post_card.html", {"post": entry.as_post()}
+    ) == render_to_string("includes/post_card.html", {"post": post})
+
+
+def test_entry_follows_changes(mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 1
+    comment.delete()
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 0
+
+    post.location.name = "Новое место"
+    post.location.save()
+    post.author.username = "renamed"
+    post.author.save()
+    entry = FeedEntry.objects.get(pk=post.pk)
+    assert (entry.location_name, entry.author_username) == (
+        "Новое место", "renamed"
+    )
+
+    post.location.delete()
+    assert FeedEntry.objects.get(pk=post.pk).location_name is None
+    post.refresh_from_db()
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(pk=post.pk).exists()
+
+
+def test_bulk_unpublish_category_drops_entries(
+        published_category, many_posts_with_published_locations
+):
+    assert FeedEntry.objects.count() == len(
+        many_posts_with_published_locations
+    )
+    bulk_update(
+        Category.objects.filter(pk=published_category.pk), is_published=False
+    )
+    assert not FeedEntry.objects.exists()
+
+
+def test_future_posts_are_stored_but_hidden(client, future_posts):
+    assert FeedEntry.objects.count() == len(future_posts)
+    assert not client.get("/").context["page_obj"].object_list
+
+
+def test_rebuild_feed(many_posts_with_published_locations):
+    expected = list(FeedEntry.objects.values())
+    FeedEntry.objects.all().delete()
+    out = StringIO()
+    call_command("rebuild_feed", stdout=out)
+    assert list(FeedEntry.objects.values()) == expected
+    assert str(len(expected)) in out.getvalue()
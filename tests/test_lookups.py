@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.forms import PostForm
+from blog.lookups import published_categories, published_locations
+from blog.models import Category, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def category_queries(queries):
+    return [
+        query for query in queries
+        if query["sql"].startswith('SELECT "blog_category"')
+    ]
+
+
+def test_category_page_resolves_category_from_cache(
+        client, many_posts_with_published_locations, published_category
+):
+    url = f"/category/{published_category.slug}/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert not category_queries(ctx.captured_queries), (
+        "Убедитесь, что при повторном открытии страницы категории сама"
+        " категория не запрашивается из базы данных."
+    )
+
+
+def test_category_cache_invalidated_on_save(client, published_category):
+    url = f"/category/{published_category.slug}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    published_category.is_published = False
+    published_category.save()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    published_category.is_published = True
+    published_category.save()
+    assert client.get(url).status_code == HTTPStatus.OK
+
+
+def test_location_lookup(published_location, django_assert_num_queries):
+    location_id = published_location.pk
+    with django_assert_num_queries(1):
+        assert published_locations.get(location_id) == published_location
+        assert published_locations.get(location_id) == published_location
+    published_location.delete()
+    assert published_locations.get(location_id) is None
+
+
+def test_missing_category_is_cached(django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert published_categories.get("missing") is None
+        assert published_categories.get("missing") is None
+
+
+def test_post_form_keeps_unpublished_choices(
+        post_with_published_location, mixer
+):
+    post = post_with_published_location
+    Category.objects.filter(pk=post.category_id).update(is_published=False)
+    Location.objects.filter(pk=post.location_id).update(is_published=False)
+    post = Post.objects.get(pk=post.pk)
+    form = PostForm(instance=post)
+    assert post.category_id in dict(form.fields["category"].choices)
+    assert post.location_id in dict(form.fields["location"].choices), (
+        "Убедитесь, что при редактировании поста в списках остаются его"
+        " категория и местоположение, даже снятые с публикации."
+    )
+    form = PostForm(instance=post, data={
+        "title": post.title,
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+        "category": post.category_id,
+        "location": post.location_id,
+        "is_published": True,
+    })
+    assert form.is_valid(), form.errors
+    assert form.save().location_id == post.location_id
+    other = mixer.blend("blog.Location", is_published=False)
+    assert not PostForm(instance=post, data={
+        **form.data, "location": other.pk,
+    }).is_valid()
+
+
+def test_location_search_cached_per_prefix(mixer, django_assert_num_queries):
+    moscow = mixer.blend("blog.Location", name="Москва")
+    minsk = mixer.blend("blog.Location", name="Минск")
+    assert published_locations.search("МОСК") == [(moscow.pk, "Москва")]
+    with django_assert_num_queries(0):
+        assert published_locations.search("мос") == [(moscow.pk, "Москва")]
+    with django_assert_num_queries(1):
+        assert published_locations.search("мин") == [(minsk.pk, "Минск")]
+
+
+def test_location_search_beyond_prefix_bucket(mixer, monkeypatch):
+    monkeypatch.setattr(published_locations, "search_rows_max", 5)
+    Location.objects.bulk_create(
+        Location(name=f"Санаторий {number}", is_published=True)
+        for number in range(6)
+    )
+    spb = mixer.blend(
+        "blog.Location", name="Санкт-Петербург", is_published=True
+    )
+    yalta = mixer.blend(
+        "blog.Location", name="Санаторий Ялта", is_published=True
+    )
+    assert published_locations.search("санкт") == [
+        (spb.pk, "Санкт-Петербург")
+    ], (
+        "Убедитесь, что поиск находит место, даже если по первым буквам"
+        " запроса найдено больше `search_rows_max` мест."
+    )
+    assert published_locations.search("санаторий ялт") == [
+        (yalta.pk, "Санаторий Ялта")
+    ]
+    assert len(published_locations.search("сана", limit=3)) == 3
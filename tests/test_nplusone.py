@@ -0,0 +1,44 @@
+import pytest
+from django.template.loader import render_to_string
+
+from perf.nplusone import NPlusOneError
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.nplusone
+@pytest.mark.parametrize("url", ["/", "/profile/{username}/"])
+def test_feed_pages_without_nplusone(
+        user, user_client, many_posts_with_published_locations, url
+):
+    user_client.get(url.format(username=user.username))
+
+
+@pytest.mark.nplusone
+def test_category_page_without_nplusone(
+        client, many_posts_with_published_locations, published_category
+):
+    client.get(f"/category/{published_category.slug}/")
+
+
+@pytest.mark.nplusone
+def test_post_comments_without_nplusone(
+        mixer, client, post_with_published_location
+):
+    mixer.cycle(6).blend("blog.Comment", post=post_with_published_location)
+    client.get(f"/posts/{post_with_published_location.id}/")
+
+
+def test_nplusone_attributed_to_template(
+        nplusone_guard, many_posts_with_published_locations
+):
+    from blog.models import Post
+
+    with pytest.raises(NPlusOneError) as exc_info:
+        with nplusone_guard():
+            for post in Post.objects.all()[:10]:
+                render_to_string("includes/post_card.html", {"post": post})
+    assert "includes/post_card.html:" in str(exc_info.value), (
+        "Убедитесь, что повторяющиеся запросы привязываются к строке шаблона,"
+        " из которой они были выполнены."
+    )
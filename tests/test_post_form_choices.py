@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.forms import PostForm
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_create_page_does_not_load_all_locations(
+        mixer, user_client, published_category
+):
+    mixer.cycle(30).blend("blog.Location", is_published=True)
+    user_client.get("/posts/create/")
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get("/posts/create/")
+    assert response.status_code == HTTPStatus.OK
+    tables = " ".join(query["sql"] for query in ctx.captured_queries)
+    assert '"blog_location"' not in tables, (
+        "Убедитесь, что форма создания поста не загружает все"
+        " местоположения."
+    )
+    assert '"blog_category"' not in tables, (
+        "Убедитесь, что список категорий в форме берётся из кэша."
+    )
+    content = response.content.decode()
+    assert content.count("<option") == 3
+    assert published_category.title[:25] in content
+
+
+def test_post_form_accepts_only_published(
+        mixer, published_category, published_location
+):
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    data = {
+        "title": "title",
+        "text": "text",
+        "pub_date": timezone.now(),
+        "category": published_category.pk,
+        "location": published_location.pk,
+    }
+    form = PostForm(data=data)
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data["location"] == published_location
+    form = PostForm(data={**data, "category": hidden_category.pk})
+    assert not form.is_valid()
+
+
+def test_edit_form_renders_selected_location(published_location):
+    form = PostForm(initial={"location": published_location.pk})
+    assert form.fields["location"].choices[1][0] == published_location.pk
+
+
+def test_location_autocomplete(mixer, user_client, unlogged_client):
+    moscow = mixer.blend("blog.Location", name="Москва Кремль")
+    mixer.blend("blog.Location", name="Минск")
+    mixer.blend(
+        "blog.Location", name="Московская область", is_published=False
+    )
+    url = "/locations/autocomplete/"
+    response = user_client.get(url, {"q": "мос"})
+    assert response.json() == {
+        "results": [{"id": moscow.pk, "name": "Москва Кремль"}]
+    }
+    response = user_client.get(url, {"q": "кре мос"})
+    assert [item["id"] for item in response.json()["results"]] == [moscow.pk]
+    assert user_client.get(url, {"q": ""}).json() == {"results": []}
+    assert unlogged_client.get(url).status_code == HTTPStatus.FOUND
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+JOINED_TABLES = ("blog_category", "auth_user", "blog_location")
+
+
+@pytest.mark.parametrize("chain", [
+    lambda user: Post.objects.published().for_feed().with_comment_counts(),
+    lambda user: Post.objects.visible_to(user).for_feed()
+    .with_comment_counts(),
+    lambda user: Post.objects.visible_to(AnonymousUser()).filter(
+        author_id=user.pk
+    ).for_feed().with_comment_counts(),
+    lambda user: Post.objects.for_feed().with_comment_counts().published(),
+])
+def test_one_join_per_relation(user, chain):
+    sql = str(chain(user).query)
+    for table in JOINED_TABLES:
+        assert sql.count(f'JOIN "{table}"') == 1, (
+            f"Убедитесь, что таблица `{table}` присоединяется один раз, даже"
+            " если она нужна и для фильтра, и для `select_related`."
+        )
+    assert 'JOIN "blog_comment"' not in sql and "GROUP BY" not in sql, (
+        "Убедитесь, что число комментариев считается без соединения"
+        " и группировки по всем столбцам поста."
+    )
+
+
+def test_visibility(mixer, user, another_user, published_category):
+    now = timezone.now()
+    public, hidden, scheduled = mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=(value for value in (True, False, True)),
+        pub_date=(value for value in (now, now, now + timedelta(days=1))),
+    )
+    mixer.cycle(2).blend("blog.Comment", post=public)
+
+    def visible(viewer):
+        return set(Post.objects.visible_to(viewer).values_list(
+            "pk", flat=True
+        ))
+
+    assert visible(user) == {public.pk, hidden.pk, scheduled.pk}
+    assert visible(another_user) == visible(AnonymousUser()) == {public.pk}
+    assert visible(None) == {public.pk}
+    counts = dict(Post.objects.with_comment_counts().values_list(
+        "pk", "comment_count"
+    ))
+    assert counts == {public.pk: 2, hidden.pk: 0, scheduled.pk: 0}
+
+
+def test_post_detail_is_one_post_query(
+        user_client, another_user_client, mixer, user, published_category,
+        django_assert_num_queries
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    url = f"/posts/{post.pk}/"
+    assert another_user_client.get(url).status_code == 404
+    user_client.get(url)
+    # Session, user, the post with its relations, its comments.
+    with django_assert_num_queries(4):
+        assert user_client.get(url).status_code == 200
@@ -0,0 +1,52 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+# Stats row and posts page, counted from the stats row; a logged-in client
+# also loads its session and user. The profile itself comes from the cache.
+ANONYMOUS_BUDGET = 2
+LOGGED_IN_BUDGET = 4
+
+
+@pytest.fixture
+def profile_url(user, many_posts_with_published_locations, mixer):
+    mixer.blend("blog.Post", author=user, is_published=False)
+    return f"/profile/{user.username}/"
+
+
+@pytest.mark.parametrize("client_name, budget, own_posts", [
+    ("client", ANONYMOUS_BUDGET, False),
+    ("another_user_client", LOGGED_IN_BUDGET, False),
+    ("user_client", LOGGED_IN_BUDGET, True),
+])
+def test_profile_query_budget(
+        request, profile_url, django_assert_num_queries,
+        client_name, budget, own_posts
+):
+    client = request.getfixturevalue(client_name)
+    client.get(profile_url)
+    with django_assert_num_queries(budget):
+        response = client.get(profile_url)
+    paginator = response.context["page_obj"].paginator
+    assert paginator.count == paginator.object_list.count()
+    posts = paginator.object_list
+    assert any(not post.is_published for post in posts) is own_posts, (
+        "Убедитесь, что автор видит в профиле свои неопубликованные посты,"
+        " а остальные пользователи — нет."
+    )
+
+
+def test_profile_lookup_invalidated(user, user_client, client):
+    url = f"/profile/{user.username}/"
+    client.get(url)
+    user_client.post("/edit_profile/", {
+        "username": user.username,
+        "first_name": "Новое",
+        "last_name": "Имя",
+        "email": "new@example.com",
+    })
+    assert "Новое Имя" in client.get(url).content.decode()
+
+
+def test_missing_profile(client):
+    assert client.get("/profile/nobody/").status_code == 404
@@ -0,0 +1,34 @@
+import re
+
+import pytest
+from django.test import override_settings
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+SERVER_TIMING_RE = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=[\d.]+, total;dur=[\d.]+'
+)
+
+
+def test_server_timing_disabled_by_default(client):
+    response = client.get("/")
+    assert "Server-Timing" not in response, (
+        "Убедитесь, что заголовок `Server-Timing` не добавляется, пока"
+        " настройка `QUERY_TIMING` выключена."
+    )
+
+
+def test_server_timing_header(post_with_published_location, caplog):
+    with override_settings(QUERY_TIMING=True):
+        client = Client()
+        with caplog.at_level("INFO", logger="perf.requests"):
+            response = client.get("/")
+    match = SERVER_TIMING_RE.fullmatch(response.get("Server-Timing", ""))
+    assert match, (
+        "Убедитесь, что при включённой настройке `QUERY_TIMING` ответ"
+        " содержит заголовок `Server-Timing` с временем запросов к БД,"
+        " рендеринга шаблонов и общей длительностью."
+    )
+    assert int(match.group(1)) > 0
+    assert any('"path": "/"' in record.message for record in caplog.records)
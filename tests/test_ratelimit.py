@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from blog.models import Comment, Post
+from perf.ratelimit import client_ip, limiter, parse_rate, take_token
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_token_bucket():
+    assert parse_rate("10/m") == (10, 60)
+    with pytest.raises(ImproperlyConfigured):
+        parse_rate("10 per minute")
+    state = None
+    for _ in range(3):
+        state, wait = take_token(state, 3, 60, now=0)
+        assert wait == 0
+    state, wait = take_token(state, 3, 60, now=0)
+    assert wait == 20, "Убедитесь, что пустое ведро сообщает время ожидания."
+    state, wait = take_token(state, 3, 60, now=20)
+    assert wait == 0, "Убедитесь, что ведро пополняется со временем."
+
+
+@override_settings(RATELIMITS={"comment": {"user": "2/m", "post": "3/m"}})
+def test_comment_flood_rejected_before_blog_queries(
+        user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    for _ in range(2):
+        response = user_client.post(url, {"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.FOUND
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert not [
+        query for query in ctx.captured_queries if '"blog_' in query["sql"]
+    ], (
+        "Убедитесь, что при превышении лимита комментариев возвращается"
+        " статус 429, а к таблицам блога не выполняется ни одного запроса."
+    )
+    assert int(response["Retry-After"]) > 0
+    assert another_user_client.post(
+        url, {"text": "Комментарий"}
+    ).status_code == HTTPStatus.FOUND
+    assert another_user_client.post(
+        url, {"text": "Комментарий"}
+    ).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        "Убедитесь, что число комментариев к одному посту ограничено"
+        " независимо от автора."
+    )
+    assert Comment.objects.count() == 3
+    assert limiter.stats()["comment"] == {
+        "allowed": 3, "rejected": {"user": 1, "post": 1},
+    }
+
+
+@override_settings(RATELIMITS={"comment": {"user": "10/m", "post": "3/m"}})
+def test_anonymous_flood_does_not_block_post(
+        client, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    for _ in range(5):
+        assert client.post(url, {"text": "Спам"}).status_code == (
+            HTTPStatus.FOUND
+        )
+    client.cookies["sessionid"] = "forged"
+    assert client.post(url, {"text": "Спам"}).status_code == HTTPStatus.FOUND
+    assert user_client.post(
+        url, {"text": "Комментарий"}
+    ).status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что запросы анонимных посетителей не расходуют лимит"
+        " комментариев к посту."
+    )
+    assert Comment.objects.count() == 1
+
+
+@override_settings(RATELIMITS={"post": {"user": "1/h"}})
+def test_post_create_limited(user_client, published_category):
+    data = {
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": "2024-01-01 12:00",
+        "category": published_category.id,
+    }
+    assert user_client.get("/posts/create/").status_code == HTTPStatus.OK
+    assert user_client.post("/posts/create/", data).status_code == (
+        HTTPStatus.FOUND
+    )
+    assert user_client.post("/posts/create/", data).status_code == (
+        HTTPStatus.TOO_MANY_REQUESTS
+    )
+    assert Post.objects.count() == 1
+
+
+@override_settings(RATELIMITS={"signup": {"ip": "1/h"}})
+def test_signup_limited_by_ip(client):
+    url = "/auth/registration/"
+    data = {
+        "username": "new_user",
+        "password1": "Sup3r-secret-pass",
+        "password2": "Sup3r-secret-pass",
+    }
+    assert client.post(url, data).status_code == HTTPStatus.FOUND
+    assert client.post(url, {**data, "username": "other"}).status_code == (
+        HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+def test_client_ip_behind_proxy():
+    request = RequestFactory().get(
+        "/", REMOTE_ADDR="10.0.0.1",
+        HTTP_X_FORWARDED_FOR="1.1.1.1, 203.0.113.5",
+    )
+    assert client_ip(request) == "10.0.0.1"
+    with override_settings(RATELIMIT_TRUSTED_PROXIES=1):
+        assert client_ip(request) == "203.0.113.5", (
+            "Убедитесь, что за обратным прокси адрес клиента берётся из"
+            " X-Forwarded-For, а не подставляется клиентом."
+        )
+
+
+def test_rate_limits_page_is_staff_only(admin_client, user_client):
+    url = "/admin/perf/ratelimits/"
+    assert admin_client.get(url).status_code == HTTPStatus.OK
+    assert user_client.get(url).status_code == HTTPStatus.FOUND
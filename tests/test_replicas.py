@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.sessions.models import Session
+
+from blog.lookups import published_categories
+from blog.models import Post
+from perf.replicas import STICKY_COOKIE, ReplicaRouter, use_replica
+
+
+def test_router():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    with use_replica("replica"):
+        assert router.db_for_read(Post) == "replica"
+        assert router.db_for_read(Session) is None
+        assert router.db_for_write(Post) == "default"
+    assert router.db_for_read(Post) is None
+
+
+@pytest.fixture
+def routed_reads(monkeypatch, settings):
+    """Aliases the router picks; the queries themselves stay on default."""
+    settings.DATABASE_REPLICAS = ["replica"]
+    reads = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        reads.append(db_for_read(self, model, **hints))
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", spy)
+    return reads
+
+
+@pytest.mark.django_db
+def test_feed_views_read_from_replica(
+        routed_reads, client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/posts/{post.pk}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        routed_reads.clear()
+        assert client.get(url).status_code == HTTPStatus.OK
+        assert routed_reads and set(routed_reads) == {"replica"}, (
+            f"Убедитесь, что страница `{url}` читает данные с реплики,"
+            " в том числе при рендеринге шаблона."
+        )
+
+
+@pytest.mark.django_db
+def test_writes_stick_to_primary(
+        routed_reads, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.pk}/comment/", {"text": "comment"}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert STICKY_COOKIE in response.cookies
+    assert "replica" not in routed_reads
+    routed_reads.clear()
+    assert user_client.get(f"/posts/{post.pk}/").status_code == HTTPStatus.OK
+    assert "replica" not in routed_reads, (
+        "Убедитесь, что после записи пользователь читает с основной базы."
+    )
+    user_client.cookies[STICKY_COOKIE] = "0"
+    routed_reads.clear()
+    user_client.get(f"/posts/{post.pk}/")
+    assert "replica" in routed_reads
+
+
+@pytest.mark.django_db
+def test_other_views_use_primary(routed_reads, user_client):
+    assert user_client.get("/edit_profile/").status_code == HTTPStatus.OK
+    assert "replica" not in routed_reads
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lookup_caches_are_filled_from_primary(
+        client, published_category, sqlite_replica
+):
+    category = published_category
+    url = f"/category/{category.slug}/"
+    category.is_published = False
+    category.save()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    sqlite_replica.sync()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert published_categories.get(category.slug) is None, (
+        "Убедитесь, что кэш опубликованных объектов заполняется из основной"
+        " базы, а не из отстающей реплики."
+    )
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.scheduler import PublicationScheduler
+from blog.signals import post_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def published():
+    events = []
+
+    def receiver(instance, **kwargs):
+        events.append(instance.pk)
+
+    post_published.connect(receiver)
+    yield events
+    post_published.disconnect(receiver)
+
+
+@pytest.fixture
+def watermark(tmp_path):
+    return tmp_path / "watermark"
+
+
+def schedule(mixer, published_category, *hours):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post",
+            category=published_category,
+            pub_date=now + timedelta(hours=hour),
+        )
+        for hour in hours
+    ]
+
+
+def test_first_run_skips_old_posts(
+        published, watermark, post_with_published_location
+):
+    scheduler = PublicationScheduler(watermark, lookahead=60)
+    assert scheduler.tick(timezone.now()) == []
+    assert published == []
+    assert watermark.exists()
+
+
+def test_post_published_once_when_due(
+        mixer, published, watermark, published_category
+):
+    scheduler = PublicationScheduler(watermark, lookahead=3 * 3600)
+    later, sooner = schedule(mixer, published_category, 2, 1)
+    now = timezone.now()
+    scheduler.tick(now)
+    assert scheduler.next_due() == sooner.pub_date
+    assert published == []
+    scheduler.tick(sooner.pub_date)
+    assert published == [sooner.pk]
+    scheduler.tick(now + timedelta(hours=3))
+    scheduler.tick(now + timedelta(hours=4))
+    assert published == [sooner.pk, later.pk], (
+        "Убедитесь, что событие о публикации отправляется один раз,"
+        " когда наступает `pub_date` поста."
+    )
+
+
+def test_catch_up_after_restart(
+        mixer, published, watermark, published_category
+):
+    now = timezone.now()
+    PublicationScheduler(watermark, lookahead=60).tick(now)
+    posts = schedule(mixer, published_category, 2, 1)
+    restarted = PublicationScheduler(watermark, lookahead=60)
+    restarted.tick(now + timedelta(hours=3))
+    assert published == [posts[1].pk, posts[0].pk], (
+        "Убедитесь, что после перезапуска публикуются посты, время"
+        " которых наступило, пока планировщик не работал."
+    )
+    PublicationScheduler(watermark, lookahead=60).tick(
+        now + timedelta(hours=3)
+    )
+    assert len(published) == 2
+
+
+def test_unpublished_and_rescheduled_posts(
+        mixer, published, watermark, published_category
+):
+    scheduler = PublicationScheduler(watermark, lookahead=3 * 3600)
+    now = timezone.now()
+    hidden, moved = schedule(mixer, published_category, 1, 1)
+    scheduler.tick(now)
+    hidden.is_published = False
+    hidden.save()
+    moved.pub_date = now + timedelta(hours=2)
+    moved.save()
+    scheduler.tick(now + timedelta(hours=1, minutes=30))
+    assert published == []
+    scheduler.tick(now + timedelta(hours=2))
+    assert published == [moved.pk]
+
+
+def test_publish_scheduled_command(
+        mixer, published, watermark, published_category
+):
+    call_command("publish_scheduled", "--once", watermark=watermark)
+    post = mixer.blend(
+        "blog.Post",
+        category=published_category,
+        pub_date=timezone.now() + timedelta(milliseconds=1),
+    )
+    out = StringIO()
+    call_command("publish_scheduled", "--once", watermark=watermark,
+                 stdout=out)
+    assert published == [post.pk]
+    assert f"#{post.pk}" in out.getvalue()
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.client import Client
+
+from perf.slow_queries import SlowQueryStore, store
+from perf.sql import fingerprint
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def slow_query_store():
+    store.clear()
+    yield store
+    store.clear()
+
+
+def test_fingerprint_normalizes_literals():
+    assert fingerprint(
+        'SELECT "blog_post"."id" FROM "blog_post"'
+        " WHERE \"blog_post\".\"id\" IN (%s, %s, %s) AND title = 'x' LIMIT 21"
+    ) == fingerprint(
+        'SELECT "blog_post"."id" FROM "blog_post"'
+        ' WHERE "blog_post"."id" IN (%s) AND title = %s LIMIT 10'
+    )
+
+
+def test_store_is_bounded():
+    bounded = SlowQueryStore(max_fingerprints=2, window=3)
+    for table in ("a", "b", "c"):
+        for duration in (0.1, 0.2, 0.3, 0.4):
+            bounded.record(f"SELECT * FROM {table}", duration)
+    rows = bounded.top(order_by="count")
+    assert [row["fingerprint"] for row in rows] == [
+        "SELECT * FROM b", "SELECT * FROM c"
+    ]
+    assert rows[0]["count"] == 4
+    assert rows[0]["p50_ms"] == 300.0
+    assert rows[0]["max_ms"] == 400.0
+
+
+def test_slow_queries_recorded_with_plan(
+        slow_query_store, post_with_published_location, tmp_path
+):
+    snapshot = tmp_path / "slow.json"
+    with override_settings(
+        SLOW_QUERY_LOG=True,
+        SLOW_QUERY_THRESHOLD_MS=0,
+        SLOW_QUERY_SNAPSHOT=snapshot,
+        SLOW_QUERY_SNAPSHOT_INTERVAL=0,
+    ):
+        Client().get("/")
+    rows = slow_query_store.top()
+    assert any(
+        'FROM "blog_feedentry"' in row["fingerprint"] and row["plan"]
+        for row in rows
+    ), (
+        "Убедитесь, что для медленных запросов сохраняется план"
+        " выполнения `EXPLAIN QUERY PLAN`."
+    )
+    out = StringIO()
+    call_command("slow_queries", snapshot=str(snapshot), stdout=out)
+    assert 'FROM "blog_feedentry"' in out.getvalue()
+
+
+def test_slow_queries_page_is_staff_only(
+        slow_query_store, admin_client, user_client
+):
+    url = "/admin/perf/slow-queries/"
+    assert admin_client.get(url).status_code == HTTPStatus.OK
+    assert user_client.get(url).status_code == HTTPStatus.FOUND
+
+
+def test_fast_queries_are_not_fingerprinted(slow_query_store):
+    with override_settings(
+        SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=10_000
+    ), mock.patch("perf.slow_queries.fingerprint") as fingerprint_mock:
+        Client().get("/")
+    assert not fingerprint_mock.called, (
+        "Убедитесь, что отпечаток строится только для запросов дольше"
+        " `SLOW_QUERY_THRESHOLD_MS`."
+    )
+    assert slow_query_store.top() == []
@@ -0,0 +1,45 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from perf.sqlite import PRAGMA_PROFILES, get_pragmas
+
+
+def test_get_pragmas(settings):
+    settings.SQLITE_PRAGMAS = None
+    assert get_pragmas() == {}
+    assert get_pragmas("production") == PRAGMA_PROFILES["production"]
+    assert get_pragmas({"cache_size": -2000}) == {"cache_size": -2000}
+    for invalid in ("missing", {"cache_size": "1; DROP TABLE x"}):
+        with pytest.raises(ImproperlyConfigured):
+            get_pragmas(invalid)
+
+
+@pytest.mark.django_db
+def test_profile_applied_to_new_connections(settings, tmp_path):
+    settings.SQLITE_PRAGMAS = "production"
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        alias="pragmas",
+    )
+    try:
+        with wrapper.cursor() as cursor:
+            values = {}
+            for name in ("journal_mode", "busy_timeout", "synchronous",
+                         "temp_store"):
+                cursor.execute(f"PRAGMA {name}")
+                values[name] = cursor.fetchone()[0]
+    finally:
+        wrapper.close()
+    assert values == {
+        "journal_mode": "wal", "busy_timeout": 5000,
+        "synchronous": 1, "temp_store": 2,
+    }
+
+
+@pytest.mark.django_db
+def test_checkpoint_requires_wal():
+    with pytest.raises(CommandError):
+        call_command("sqlite_checkpoint")
@@ -0,0 +1,64 @@
+import pytest
+from django.conf import settings
+from django.template import Context, Engine, engines
+
+from perf.template_inliner import TemplateInliner
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def inliner():
+    return TemplateInliner([settings.TEMPLATES_DIR])
+
+
+def test_inlined_cards_render_identically(
+        inliner, many_posts_with_published_locations
+):
+    source = (
+        '{% for post in posts %}{% include "includes/post_card.html" %}'
+        "{% endfor %}"
+    )
+    inlined = inliner.inline(source)
+    assert "{% include" not in inlined
+    engine = Engine(
+        dirs=[settings.TEMPLATES_DIR],
+        libraries=engines["django"].engine.libraries,
+    )
+    context = {"posts": many_posts_with_published_locations}
+    assert engine.from_string(inlined).render(Context(context)) == (
+        engine.from_string(source).render(Context(context))
+    ), "Убедитесь, что встраивание include не меняет результат рендеринга."
+
+
+def test_not_inlinable_includes_kept(inliner, tmp_path):
+    (tmp_path / "block.html").write_text("{% block a %}{% endblock %}")
+    (tmp_path / "assigns.html").write_text("{% url 'blog:index' as x %}")
+    (tmp_path / "plain.html").write_text("plain")
+    (tmp_path / "cycle.html").write_text("{% cycle 'odd' 'even' %}")
+    (tmp_path / "changed.html").write_text(
+        "{% ifchanged %}x{% endifchanged %}"
+    )
+    inliner = TemplateInliner([tmp_path])
+    source = (
+        '{% include "block.html" %}{% include "assigns.html" %}'
+        '{% include "plain.html" with a=1 %}{% include "plain.html" %}'
+        '{% include "missing.html" %}{% include "cycle.html" %}'
+        '{% include "changed.html" %}'
+    )
+    assert inliner.inline(source) == (
+        '{% include "block.html" %}{% include "assigns.html" %}'
+        '{% include "plain.html" with a=1 %}plain'
+        '{% include "missing.html" %}{% include "cycle.html" %}'
+        '{% include "changed.html" %}'
+    ), (
+        "Убедитесь, что шаблоны с `{% cycle %}` и `{% ifchanged %}` не"
+        " встраиваются: у каждого `include` своё состояние этих тегов."
+    )
+
+
+def test_compile_dir_writes_only_changed(inliner, tmp_path):
+    compiled = inliner.compile_dir(settings.TEMPLATES_DIR, tmp_path)
+    assert "blog/index.html" in compiled
+    assert "includes/category_link.html" not in compiled
+    assert "{% include" not in (tmp_path / "blog/index.html").read_text()
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+
+from perf.template_profiler import profiler
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def installed_profiler():
+    profiler.reset()
+    profiler.install()
+    yield profiler
+    profiler.uninstall()
+    profiler.reset()
+
+
+def test_profiler_counts_includes_and_urls(
+        installed_profiler, client, many_posts_with_published_locations
+):
+    client.get("/")
+    stats = {row["name"]: row for row in installed_profiler.top()}
+    assert stats["includes/post_card.html"]["calls"] == 10
+    assert stats['include "includes/category_link.html"']["calls"] == 10
+    assert stats["url 'blog:post_detail'"]["calls"] == 20
+    assert stats["blog/index.html"]["cumulative_ms"] >= (
+        stats["includes/post_card.html"]["cumulative_ms"]
+    )
+
+
+def test_profiler_folded_output(installed_profiler, admin_client):
+    admin_client.get("/pages/about/")
+    response = admin_client.get("/admin/perf/templates/?format=folded")
+    assert response.status_code == HTTPStatus.OK
+    lines = response.content.decode().splitlines()
+    assert any(
+        line.startswith(
+            "pages/about.html;base.html;include \"includes/header.html\";"
+            "includes/header.html;url 'pages:about' "
+        )
+        for line in lines
+    ), (
+        "Убедитесь, что стеки рендеринга выгружаются в формате flamegraph:"
+        " `шаблон;вложенный шаблон;тег значение`."
+    )
+    assert admin_client.get("/admin/perf/templates/").status_code == (
+        HTTPStatus.OK
+    )
@@ -0,0 +1,135 @@
+import time
+from collections import Counter
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry, Post
+from blog.view_counts import ViewCounter, view_counter
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_detail_view_buffers_views(client, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    for _ in range(3):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query for query in ctx.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ], "Убедитесь, что просмотр публикации не записывается в базу сразу."
+    assert response.context["post"].view_count == 3, (
+        "Убедитесь, что на странице публикации видны и ещё не записанные"
+        " просмотры."
+    )
+    assert Post.objects.get(pk=post.pk).view_count == 0
+    assert view_counter.pending(post.pk) == 3
+
+
+def test_flush_adds_deltas(mixer, many_posts_with_published_locations):
+    counter = ViewCounter()
+    first, second, third = many_posts_with_published_locations[:3]
+    for post, views in ((first, 2), (second, 2), (third, 5)):
+        for _ in range(views):
+            counter.hit(post.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        assert counter.flush() == 3
+    updates = [
+        query for query in ctx.captured_queries
+        if query["sql"].startswith("UPDATE")
+    ]
+    assert len(updates) == 4, (
+        "Убедитесь, что посты с одинаковым приростом просмотров обновляются"
+        " одним запросом UPDATE."
+    )
+    assert Post.objects.get(pk=third.pk).view_count == 5
+    assert FeedEntry.objects.get(pk=third.pk).view_count == 5
+    counter.hit(first.pk)
+    counter.flush()
+    assert Post.objects.get(pk=first.pk).view_count == 3
+    assert counter.flush() == 0
+    assert counter.written == 10
+
+
+def test_index_shows_feed_view_counts(client, post_with_published_location):
+    view_counter.hit(post_with_published_location.pk)
+    view_counter.flush()
+    assert "Просмотры: 1" in client.get("/").content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_flushes(post_with_published_location):
+    counter = ViewCounter(interval=60, max_pending=2)
+    post = post_with_published_location
+    try:
+        counter.hit(post.pk)
+        counter.hit(post.pk)
+        deadline = time.monotonic() + 5
+        while counter.flushes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert counter.flushes == 1, (
+            "Убедитесь, что накопленные просмотры записываются, не дожидаясь"
+            " интервала, как только их набирается VIEW_COUNT_MAX_PENDING."
+        )
+        counter.hit(post.pk)
+    finally:
+        counter.stop()
+    assert Post.objects.get(pk=post.pk).view_count == 3, (
+        "Убедитесь, что при остановке записываются оставшиеся просмотры."
+    )
+
+
+def test_post_save_keeps_flushed_views(
+        user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    stale = Post.objects.get(pk=post.pk)
+    view_counter.hit(post.pk)
+    view_counter.hit(post.pk)
+    view_counter.flush()
+    stale.title = "Новый заголовок"
+    stale.save()
+    response = user_client.post(f"/posts/{post.pk}/edit/", {
+        "title": "Из формы",
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+        "category": post.category_id,
+        "is_published": True,
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    saved = Post.objects.get(pk=post.pk)
+    assert (saved.title, saved.view_count) == ("Из формы", 2), (
+        "Убедитесь, что сохранение публикации не перезаписывает просмотры,"
+        " записанные после её загрузки."
+    )
+    assert FeedEntry.objects.get(pk=post.pk).view_count == 2
+
+
+def test_failed_flush_keeps_bounded_views(post_with_published_location):
+    post = post_with_published_location
+    counter = ViewCounter(max_pending=3)
+    counter.hit(post.pk)
+    counter.hit(post.pk)
+    with mock.patch.object(
+        Post.objects, "filter", side_effect=DatabaseError("gone")
+    ):
+        with pytest.raises(DatabaseError):
+            counter.flush()
+    assert counter.pending(post.pk) == 2, (
+        "Убедитесь, что просмотры, которые не удалось записать, сохраняются"
+        " до следующей записи."
+    )
+    counter._restore(Counter({post.pk: 5}))
+    assert counter.pending(post.pk) == 3
+    assert counter.dropped == 4, (
+        "Убедитесь, что при недоступной базе данных в памяти хранится не"
+        " больше VIEW_COUNT_MAX_PENDING просмотров."
+    )
+    assert counter.flush() == 1
+    assert Post.objects.get(pk=post.pk).view_count == 3